@@ -1,123 +1,135 @@
-import sys
-import re  # For regex support
 import os
-import string
+import queue
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from codec import Codec, vigenere_like_encrypt, vigenere_like_decrypt
+from codec import tokenize, DEFAULT_DATABASE_PATH, JOIN
+from reloader import DictionaryReloader
+from nearest import TolerantDecoder
+from js8bridge import JS8Bridge
+from keyring import Keyring
+from codeccache import CodecCache
+from metrics import Metrics
+
 # ====================
 # DICTIONARY SECTION
 # ====================
-REFERENCE_DICTIONARY = {}  # Initialize as empty; will be loaded from database.txt
-REVERSE_DICTIONARY = {}    # Reverse dictionary for decryption
+CODEC = Codec()  # Dictionary is loaded lazily from database.txt
 
-# Define the allowed character set (uppercase letters, numbers, and special characters)
-ALLOWED_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-SPECIAL_CHARS = ['@', '$', '#', '%', '&', '~', '{', '}', '[', ']', '^']  # Added new special characters
-CHAR_SET_LENGTH = len(ALLOWED_CHARS)
+# Reload results, produced on the reloader's timer thread and read by the GUI
+reload_queue = queue.Queue()
+RELOADER = DictionaryReloader(CODEC, delay=0.5, notify=reload_queue.put)
 
-# Function to load the dictionary from database.txt
-def load_dictionary():
-    global REFERENCE_DICTIONARY, REVERSE_DICTIONARY
-    try:
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        database_path = os.path.join(base_dir, "database.txt")
-
-        if not os.path.exists(database_path):
-            raise FileNotFoundError("The database.txt file was not found.")
-
-        with open(database_path, "r") as file:
-            REFERENCE_DICTIONARY = {}
-            for line in file:
-                line = line.strip()
-                if line and ":" in line:
-                    key, value = line.split(":", 1)
-                    REFERENCE_DICTIONARY[key.strip()] = value.strip()
-                else:
-                    raise ValueError(f"Invalid line format in database.txt: {line}")
+# Repairs received tokens that are one character away from a code
+TOLERANT_DECODER = TolerantDecoder(CODEC)
+
+# Per-contact passwords and per-net dictionary profiles, read from keyring.json at startup
+KEYRING = Keyring()
+
+# Dictionaries of recently used profiles stay loaded, so switching back is instant
+CODEC_CACHE = CodecCache()
+DEFAULT_PROFILE = "database.txt"
+
+# Function to pick the Codec for a station: its profile's dictionary, or the active one
+def codec_for(callsign):
+    profile = KEYRING.profile_for(callsign)
+    if profile is None:
+        return CODEC
+    return CODEC_CACHE.get(KEYRING.dictionary_path(profile), profile.seed)
 
-        REVERSE_DICTIONARY = {v: k for k, v in REFERENCE_DICTIONARY.items()}
+# Function to decode a payload with error tolerance, with whichever Codec it belongs to
+def tolerant_decode(payload, password, codec):
+    if codec is CODEC:
+        return TOLERANT_DECODER.decode(payload, password)[0]
+    return CODEC_CACHE.decoder(codec.database_path, codec.seed).decode(payload, password)[0]
 
+# Messages from the JS8Call bridge thread, read by the GUI
+bridge_queue = queue.Queue()
+
+# Stage timings and payload metrics, only when JACKRABBIT_METRICS is set (see metrics.py)
+METRICS = Metrics.from_environment()
+
+# Function to load the dictionary from database.txt; returns the metrics summary, if any
+def load_dictionary():
+    measurement = METRICS.measure("load_dictionary")
+    try:
+        with measurement.stage("reload"):
+            RELOADER.reload()
+        measurement.count(entries=len(CODEC.reference), compiled=CODEC.compiled)
+        return METRICS.record(measurement)
     except FileNotFoundError as e:
         messagebox.showwarning("File Not Found", str(e))
-        REFERENCE_DICTIONARY = {}
-        REVERSE_DICTIONARY = {}
+        CODEC.set_dictionary({})
     except Exception as e:
         messagebox.showwarning("Error Loading Dictionary", f"An error occurred: {str(e)}")
-        REFERENCE_DICTIONARY = {}
-        REVERSE_DICTIONARY = {}
+        CODEC.set_dictionary({})
 
-# Watchdog handler to reload the dictionary when database.txt changes
+# Function to read keyring.json; a file that cannot be used is reported and the keyring stays empty
+def load_keyring():
+    global KEYRING
+    try:
+        KEYRING = Keyring.load()
+    except (OSError, ValueError) as e:
+        messagebox.showwarning("Error Loading Keyring", str(e))
+        KEYRING = Keyring()
+
+# Watchdog handler to reload the dictionary when the active dictionary file changes.
+# Runs on the watchdog thread, so it only schedules a debounced reload.
 class DictionaryFileHandler(FileSystemEventHandler):
+    @staticmethod
+    def is_dictionary(path):
+        return os.path.abspath(path) == os.path.abspath(CODEC.database_path)
+
     def on_modified(self, event):
-        if event.src_path.endswith("database.txt"):
-            load_dictionary()
-            messagebox.showinfo("Dictionary Updated", "The dictionary has been reloaded.")
+        if self.is_dictionary(event.src_path):
+            RELOADER.schedule()
 
-# Initialize the file watcher
-def start_file_watcher():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    observer = Observer()
-    event_handler = DictionaryFileHandler()
-    observer.schedule(event_handler, path=base_dir, recursive=False)
-    observer.start()
+    def on_created(self, event):
+        if self.is_dictionary(event.src_path):
+            RELOADER.schedule()
 
-# Load the dictionary at startup
-load_dictionary()
+    def on_moved(self, event):
+        # The Manager saves by renaming a temporary file over database.txt
+        if self.is_dictionary(event.dest_path):
+            RELOADER.schedule()
 
-# Start the file watcher
-start_file_watcher()
+WATCHER = None
+
+# Initialize the file watcher
+def start_file_watcher():
+    global WATCHER
+    WATCHER = Observer()
+    watch_dictionary()
+    WATCHER.start()
+    return WATCHER
+
+# Point the file watcher at the directory of the active dictionary
+def watch_dictionary():
+    if WATCHER is None:
+        return
+    WATCHER.unschedule_all()
+    base_dir = os.path.dirname(os.path.abspath(CODEC.database_path))
+    WATCHER.schedule(DictionaryFileHandler(), path=base_dir, recursive=False)
 
 # =============================================
 # HIGHLIGHTING FUNCTION
 # =============================================
-def highlight_missing_words(text_widget, missing_words):
-    """Highlights words not in the dictionary within the given text widget."""
+def highlight_missing_words(text_widget, tokens, first_index="1.0", last_index=tk.END):
+    """Highlights words not in the dictionary within the given text widget.
+
+    tokens come from codec.tokenize() on the text between first_index and
+    last_index, so this is one pass over the tokens instead of one search
+    per word.
+    """
     text_widget.tag_configure("missing", foreground="red")
-    text_widget.tag_remove("missing", "1.0", tk.END)
-
-    for word in missing_words:
-        start = "1.0"
-        while True:
-            pos = text_widget.search(re.escape(word), start, stopindex=tk.END, nocase=True)
-            if not pos:
-                break
-            end = f"{pos}+{len(word)}c"
-            text_widget.tag_add("missing", pos, end)
-            start = end
+    text_widget.tag_remove("missing", first_index, last_index)
 
-# =============================================
-# ENCRYPTION/DECRYPTION FUNCTIONS
-# =============================================
-def vigenere_like_encrypt(text, key):
-    """Encrypts text using a Vigenère-like cipher, ensuring output is within the allowed character set."""
-    key = (key * (len(text) // len(key) + 1))[:len(text)]
-    encrypted = []
-    for t, k in zip(text, key):
-        if t in ALLOWED_CHARS and k.upper() in ALLOWED_CHARS:
-            t_index = ALLOWED_CHARS.index(t)
-            k_index = ALLOWED_CHARS.index(k.upper())
-            new_index = (t_index + k_index) % CHAR_SET_LENGTH
-            encrypted.append(ALLOWED_CHARS[new_index])
-        else:
-            encrypted.append(t)  # Preserve special characters
-    return ''.join(encrypted)
-
-def vigenere_like_decrypt(text, key):
-    """Decrypts text using a Vigenère-like cipher, ensuring output is within the allowed character set."""
-    key = (key * (len(text) // len(key) + 1))[:len(text)]
-    decrypted = []
-    for t, k in zip(text, key):
-        if t in ALLOWED_CHARS and k.upper() in ALLOWED_CHARS:
-            t_index = ALLOWED_CHARS.index(t)
-            k_index = ALLOWED_CHARS.index(k.upper())
-            new_index = (t_index - k_index) % CHAR_SET_LENGTH
-            decrypted.append(ALLOWED_CHARS[new_index])
-        else:
-            decrypted.append(t)  # Preserve special characters
-    return ''.join(decrypted)
+    for token in tokens:
+        if token.missing:
+            text_widget.tag_add("missing", f"{first_index}+{token.start}c", f"{first_index}+{token.end}c")
 
 # =============================================
 # GUI APPLICATION
@@ -126,7 +138,7 @@ class CryptoApp:
     def __init__(self, root):
         self.root = root
         self.root.title("JackRabbit v5")
-        self.root.geometry("380x460")
+        self.root.geometry("380x520")
 
         # Input Text
         self.input_label = ttk.Label(root, text="Input Text:")
@@ -136,11 +148,34 @@ class CryptoApp:
         text_font = ("Arial", 12)
         self.input_text.configure(font=text_font)
 
+        # Live payload estimate, refreshed while typing
+        self.payload_label = ttk.Label(root, text="Payload: 0 characters")
+        self.payload_label.pack()
+        self._live_job = None
+        self._dirty_lines = set()
+        self._line_count = 0
+        self._line_cache = {}  # line text -> (payload characters, words, missing words)
+        self._live_tables = None
+        self.input_text.bind("<KeyRelease>", self.schedule_live_check)
+
         # Password
         self.password_label = ttk.Label(root, text="Password:")
         self.password_label.pack(pady=5)
         self.password_entry = ttk.Entry(root, show="*")
         self.password_entry.pack(pady=5)
+        self._bridge_password = ""  # Copy of the entry the bridge thread may read
+        self.password_entry.bind("<KeyRelease>", self.update_bridge_password)
+
+        # Profile (net): which dictionary and keyring password to use
+        self.profile_frame = ttk.Frame(root)
+        self.profile_frame.pack()
+        self.profile_label = ttk.Label(self.profile_frame, text="Profile:")
+        self.profile_label.pack(side=tk.LEFT, padx=5)
+        self.profile_box = ttk.Combobox(self.profile_frame, state="readonly", width=20,
+                                        values=[DEFAULT_PROFILE] + sorted(KEYRING.profiles))
+        self.profile_box.set(DEFAULT_PROFILE)
+        self.profile_box.pack(side=tk.LEFT)
+        self.profile_box.bind("<<ComboboxSelected>>", self.switch_profile)
 
         # Buttons (First Row)
         self.button_frame = ttk.Frame(root)
@@ -152,6 +187,16 @@ class CryptoApp:
         self.decrypt_button = ttk.Button(self.button_frame, text="Decrypt", command=self.decrypt)
         self.decrypt_button.pack(side=tk.LEFT, padx=5)
 
+        # JS8Call API: received messages are decoded, sent ones encoded, no copy/paste
+        self.bridge = JS8Bridge(CODEC, self.bridge_password_for, notify=bridge_queue.put,
+                                decode=tolerant_decode, codec_for=codec_for)
+        self._last_callsign = ""
+        self.js8_button = ttk.Button(self.button_frame, text="JS8Call", command=self.toggle_bridge)
+        self.js8_button.pack(side=tk.LEFT, padx=5)
+
+        self.send_button = ttk.Button(self.button_frame, text="Send", command=self.send_message)
+        self.send_button.pack(side=tk.LEFT, padx=5)
+
         # Buttons (Second Row)
         self.button_frame2 = ttk.Frame(root)
         self.button_frame2.pack(pady=10)
@@ -165,6 +210,9 @@ class CryptoApp:
         self.clear_button = ttk.Button(self.button_frame2, text="Clear", command=self.clear_fields)
         self.clear_button.pack(side=tk.LEFT, padx=5)
 
+        self.seed_button = ttk.Button(self.button_frame2, text="Seed", command=self.set_seed)
+        self.seed_button.pack(side=tk.LEFT, padx=5)
+
         # Output Text
         self.output_label = ttk.Label(root, text="Output:")
         self.output_label.pack(pady=5)
@@ -173,48 +221,210 @@ class CryptoApp:
         self.output_text.configure(font=text_font)
 
         # Warning Label
-        self.warning_label = tk.Label(root, text="", fg="black", bg="white", anchor="w")
+        self.warning_label = tk.Label(root, text="", fg="black", bg="white", anchor="w", justify=tk.LEFT, wraplength=360)
         self.warning_label.pack(pady=10, fill=tk.X)
 
+        # Dictionary reloads are reported through the Tk event loop
+        self.root.after(200, self.poll_reloads)
+        self.root.after(200, self.poll_bridge)
+
     def show_warning(self, message, color):
         """Update the warning label with a message and background color."""
         self.warning_label.config(text=message, bg=color)
 
+    @staticmethod
+    def with_metrics(message, summary):
+        """Status message with the metrics summary below it, when metrics are on."""
+        return f"{message}\n{summary}" if summary else message
+
+    def poll_reloads(self):
+        """Shows finished background reloads; runs on the GUI thread."""
+        try:
+            while True:
+                kind, payload = reload_queue.get_nowait()
+                if kind == "reloaded":
+                    self.show_warning(f"Dictionary reloaded ({payload.summary()}).", "light blue")
+                else:
+                    self.show_warning(f"Dictionary reload failed: {payload}", "red")
+        except queue.Empty:
+            pass
+        self.root.after(200, self.poll_reloads)
+
+    def update_bridge_password(self, event=None):
+        self._bridge_password = self.password_entry.get().strip().upper()
+
+    def bridge_password_for(self, callsign):
+        # Runs on the bridge thread, so it must not touch any widget
+        return KEYRING.password_for(callsign) or self._bridge_password
+
+    def switch_profile(self, event=None):
+        """Switches dictionary from the in-memory cache; only the first use of a profile reads its file."""
+        name = self.profile_box.get()
+        profile = KEYRING.profiles.get(name)
+        if profile is None:
+            path, seed = DEFAULT_DATABASE_PATH, None
+        else:
+            path, seed = KEYRING.dictionary_path(profile), profile.seed
+        try:
+            codec = CODEC_CACHE.get(path, seed)
+        except Exception as e:
+            self.show_warning(f"Could not load {name}: {e}", "red")
+            return
+        CODEC.database_path = codec.database_path
+        CODEC.seed = codec.seed
+        CODEC.publish(*codec.tables)
+        RELOADER.reset()
+        watch_dictionary()
+        password = KEYRING.entry(profile.password) if profile is not None else KEYRING.default
+        # Never keep the previous net's password for this one
+        self.password_entry.delete(0, tk.END)
+        if password:
+            self.password_entry.insert(0, password)
+        self.update_bridge_password()
+        self.schedule_live_check()
+        self.show_warning(f"Profile {name} active. Cache: {CODEC_CACHE.summary()}", "light blue")
+
+    def toggle_bridge(self):
+        if self.js8_button.cget("text") == "JS8Call":
+            self.bridge.start()
+            self.js8_button.config(text="JS8 Off")
+        else:
+            self.bridge.stop()
+            self.js8_button.config(text="JS8Call")
+            self.show_warning("JS8Call bridge stopped.", "white")
+
+    def send_message(self):
+        text = self.input_text.get("1.0", tk.END).strip()
+        self.update_bridge_password()
+        if not text:
+            self.show_warning("Input and password are required!", "red")
+            return
+        callsign = simpledialog.askstring("Send via JS8Call", "Callsign (or @GROUP):",
+                                          initialvalue=self._last_callsign, parent=self.root)
+        if not callsign:
+            return
+        self._last_callsign = callsign.strip().upper()
+        # The same password the station's messages are decoded with
+        password = self.bridge_password_for(self._last_callsign)
+        if not password:
+            self.show_warning("Input and password are required!", "red")
+            return
+        if self.js8_button.cget("text") == "JS8Call":
+            self.toggle_bridge()
+        self.bridge.send(text, self._last_callsign, password)
+        self.show_warning(f"Queued for {self._last_callsign}...", "light blue")
+
+    def poll_bridge(self):
+        """Shows bridge traffic; runs on the GUI thread."""
+        try:
+            while True:
+                kind, payload = bridge_queue.get_nowait()
+                if kind == "received":
+                    text = payload.text if payload.text is not None else payload.payload
+                    self.output_text.config(state="normal")
+                    self.output_text.delete("1.0", tk.END)
+                    self.output_text.insert("1.0", text)
+                    self.output_text.config(state="disabled")
+                    self.show_warning(f"Received from {payload.sender}.", "green")
+                elif kind == "sent":
+                    self.show_warning(f"Sent to {payload[0]}: {payload[1]}", "green")
+                elif kind == "connected":
+                    self.show_warning(f"JS8Call connected ({payload}).", "light blue")
+                elif kind == "error":
+                    self.show_warning(f"JS8Call: {payload}", "red")
+        except queue.Empty:
+            pass
+        self.root.after(200, self.poll_bridge)
+
+    def schedule_live_check(self, event=None):
+        """Marks the edited line and re-checks once typing pauses."""
+        line = int(self.input_text.index(tk.INSERT).split(".")[0])
+        self._dirty_lines.add(line)
+        if self._live_job is not None:
+            self.root.after_cancel(self._live_job)
+        self._live_job = self.root.after(300, self.live_check)
+
+    def live_check(self):
+        """Re-tokenizes only the edited lines, then updates the payload estimate."""
+        self._live_job = None
+        try:
+            tables = CODEC.tables
+        except Exception:
+            return
+        lines = self.input_text.get("1.0", "end-1c").split("\n")
+        if tables is not self._live_tables or len(lines) != self._line_count:
+            # Dictionary reloaded or lines added/removed: refresh every line
+            if tables is not self._live_tables:
+                self._line_cache.clear()
+            self._live_tables = tables
+            self._line_count = len(lines)
+            self._dirty_lines = set(range(1, len(lines) + 1))
+        reference = tables[0]
+        trie = CODEC.phrase_trie(reference)[0]
+        composer = CODEC.composer(reference)
+        for line in self._dirty_lines:
+            if line <= len(lines):
+                tokens = tokenize(lines[line - 1], reference, trie, composer=composer)
+                highlight_missing_words(self.input_text, tokens, f"{line}.0", f"{line}.end")
+                self._line_cache[lines[line - 1]] = self._line_stats(tokens)
+        self._dirty_lines = set()
+
+        if len(self._line_cache) > 1000:
+            self._line_cache.clear()
+        characters = words = missing = 0
+        for text in lines:
+            stats = self._line_cache.get(text)
+            if stats is None:
+                stats = self._line_cache[text] = self._line_stats(tokenize(text, reference, trie, composer=composer))
+            characters += stats[0]
+            words += stats[1]
+            missing += stats[2]
+        if words:
+            characters += words - 1  # Spaces between the words
+        self.payload_label.config(text=f"Payload: {characters} characters ({words} words, {missing} missing)")
+
+    @staticmethod
+    def _line_stats(tokens):
+        return (sum(len(token.payload) for token in tokens), sum(1 for token in tokens if token.span),
+                sum(1 for token in tokens if token.missing))
+
     def encrypt(self):
         try:
-            text = self.input_text.get("1.0", tk.END).strip().lower()
+            raw_text = self.input_text.get("1.0", "end-1c")
+            text = raw_text.strip().lower()
             password = self.password_entry.get().strip().lower()
             if not text or not password:
                 self.show_warning("Input and password are required!", "red")
                 return
 
-            words = text.split()
-            processed_words = []
-            missing_words = []
-
-            for word in words:
-                cleaned_word = word.translate(str.maketrans('', '', string.punctuation))
-                if cleaned_word in REFERENCE_DICTIONARY:
-                    processed_words.append(REFERENCE_DICTIONARY[cleaned_word])
-                else:
-                    processed_words.append(word)
-                    if len(cleaned_word) >= 4:
-                        missing_words.append(word)
-
-            highlight_missing_words(self.input_text, missing_words)
-
-            processed_text = ' '.join(processed_words).upper()
-            encrypted = vigenere_like_encrypt(processed_text, password.upper())
-
-            self.output_text.config(state="normal")
-            self.output_text.delete("1.0", tk.END)
-            self.output_text.insert("1.0", encrypted)
-            self.output_text.config(state="disabled")
-
+            measurement = METRICS.measure("encrypt")
+            with measurement.stage("tokenize"):  # Splitting and dictionary lookups happen together
+                tokens = CODEC.tokenize(raw_text)
+            with measurement.stage("highlight"):
+                highlight_missing_words(self.input_text, tokens)
+            with measurement.stage("substitute"):
+                processed_text, missing_words = CODEC.substitute_tokens(tokens)
+            with measurement.stage("cipher"):
+                encrypted = vigenere_like_encrypt(processed_text, password.upper())
+
+            with measurement.stage("widgets"):
+                self.output_text.config(state="normal")
+                self.output_text.delete("1.0", tk.END)
+                self.output_text.insert("1.0", encrypted)
+                self.output_text.config(state="disabled")
+
+            if measurement.enabled:
+                words = [token for token in tokens if token.span and token.cleaned]  # A phrase counts once
+                measurement.count(words=len(words),
+                                  hits=sum(1 for token in words if token.code is not None and JOIN not in token.code),
+                                  composed=sum(1 for token in words if token.code is not None and JOIN in token.code),
+                                  input_chars=len(raw_text.strip()), output_chars=len(encrypted))
+            summary = METRICS.record(measurement)
             if missing_words:
-                self.show_warning("Some words are not in the dictionary. Encryption still completed.", "yellow")
+                self.show_warning(self.with_metrics("Some words are not in the dictionary. Encryption still completed.",
+                                                    summary), "yellow")
             else:
-                self.show_warning("Encryption successful!", "green")
+                self.show_warning(self.with_metrics("Encryption successful!", summary), "green")
 
         except Exception as e:
             self.show_warning(f"Error: {str(e)}", "red")
@@ -227,24 +437,41 @@ class CryptoApp:
                 self.show_warning("Input and password are required!", "red")
                 return
 
-            decrypted = vigenere_like_decrypt(encrypted_text, password)
-
-            words = decrypted.split()
-            processed_words = []
-
-            for word in words:
-                if word in REVERSE_DICTIONARY:
-                    processed_words.append(REVERSE_DICTIONARY[word].lower())
-                else:
-                    processed_words.append(word.lower())
-
-            result = ' '.join(processed_words)
-
-            self.output_text.config(state="normal")
-            self.output_text.delete("1.0", tk.END)
-            self.output_text.insert("1.0", result)
-            self.output_text.config(state="disabled")
-            self.show_warning("Decryption successful!", "green")
+            measurement = METRICS.measure("decrypt")
+            with measurement.stage("cipher"):
+                decrypted = vigenere_like_decrypt(encrypted_text, password)
+            with measurement.stage("lookup"):
+                reverse = CODEC.reverse
+                result, corrections = TOLERANT_DECODER.restore(decrypted, reverse)
+
+            with measurement.stage("widgets"):
+                self.output_text.config(state="normal")
+                self.output_text.delete("1.0", tk.END)
+                self.output_text.insert("1.0", result)
+                self.output_text.tag_configure("corrected", foreground="dark orange")
+                self.output_text.tag_configure("suspect", foreground="red")
+                for correction in corrections:
+                    tag = "corrected" if correction.applied else "suspect"
+                    self.output_text.tag_add(tag, f"1.0+{correction.start}c", f"1.0+{correction.end}c")
+                self.output_text.config(state="disabled")
+
+            if measurement.enabled:
+                received = decrypted.split()
+                measurement.count(words=len(received), hits=sum(1 for token in received if reverse.get(token) is not None),
+                                  corrected=sum(1 for correction in corrections if correction.applied),
+                                  input_chars=len(encrypted_text), output_chars=len(result))
+            summary = METRICS.record(measurement)
+
+            if corrections:
+                corrected = sum(1 for correction in corrections if correction.applied)
+                unsure = ", ".join(f"{correction.received.lower()} -> {correction.word}? ({correction.confidence:.0%})"
+                                   for correction in corrections if not correction.applied)
+                message = f"Decrypted, {corrected} word(s) auto-corrected."
+                if unsure:
+                    message += f" Unsure: {unsure}"
+                self.show_warning(self.with_metrics(message, summary), "yellow")
+            else:
+                self.show_warning(self.with_metrics("Decryption successful!", summary), "green")
         except Exception as e:
             self.show_warning(f"Error: {str(e)}", "red")
 
@@ -258,11 +485,28 @@ class CryptoApp:
             clipboard_text = self.root.clipboard_get()
             self.input_text.delete("1.0", tk.END)
             self.input_text.insert("1.0", clipboard_text)
+            self.schedule_live_check()
         except tk.TclError:
             self.show_warning("No text in clipboard!", "red")
 
+    def set_seed(self):
+        """Permutes database.txt with a shared passphrase instead of loading a shuffled file."""
+        seed = simpledialog.askstring("Dictionary Seed", "Shared dictionary seed (empty for the plain file):",
+                                      show="*", parent=self.root)
+        if seed is None:
+            return
+        CODEC.seed = seed or None
+        try:
+            CODEC.load()
+        except Exception as e:
+            self.show_warning(f"Dictionary reload failed: {e}", "red")
+            return
+        self.schedule_live_check()
+        self.show_warning("Keyed dictionary active." if seed else "Plain dictionary active.", "light blue")
+
     def clear_fields(self):
         self.input_text.delete("1.0", tk.END)
+        self.schedule_live_check()
         self.password_entry.delete(0, tk.END)
         self.output_text.config(state="normal")
         self.output_text.delete("1.0", tk.END)
@@ -272,5 +516,10 @@ class CryptoApp:
 # Main Application Loop
 if __name__ == "__main__":
     root = tk.Tk()
+    load_summary = load_dictionary()
+    load_keyring()
+    start_file_watcher()
     app = CryptoApp(root)
+    if load_summary:
+        app.show_warning(f"Dictionary loaded: {load_summary}", "light blue")
     root.mainloop()
\ No newline at end of file
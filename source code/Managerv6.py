@@ -1,175 +1,345 @@
-import random
-import string
 import os
+import queue
 import tkinter as tk
-import re
-import time
+from tkinter import filedialog
 from threading import Thread
 
-# Reserved reference codes (common 2-letter English words)
-RESERVED_CODES = {
-    "WE", "SO", "BE", "IT", "DO", "AT", "IN", "OK", "TV", "PC", "FM", "AI", "AP",
-    "IQ", "DJ", "CD", "ID", "HI", "IF", "IS", "IR", "ON", "BY", "TO", "OF", "OR",
-    "AN", "AS", "MY", "UP", "HE", "GO", "NO", "US", "AM", "ME"
-}
-
-# Special characters rules
-SPECIAL_CHARACTERS = {
-    "$": "front",
-    "%": "front",
-    "@": "after",
-    "#": "after",
-    "&": "after",
-    "~": "front",  # ~ always in front
-    "{": "after",  # { always after the base code
-    "}": "front",  # } always in front
-    "[": "after",  # [ always after the base code
-    "]": "front",  # ] always in front
-    "^": "front",  # ^ always in front
-}
-
-# Allowed characters for reference codes
-ALLOWED_CHARS = string.ascii_uppercase + string.digits
-CHAR_SET_LENGTH = len(ALLOWED_CHARS)
-
-# Function to calculate maximum unique codes
-def calculate_max_codes():
-    base_codes = CHAR_SET_LENGTH ** 2  # Two-character base codes
-    special_codes = len(SPECIAL_CHARACTERS) * base_codes
-    return special_codes - len(RESERVED_CODES)
+from codec import file_lines, read_dictionary, write_dictionary
+from allocator import CodeAllocator, calculate_max_codes, capacity_report
+from ingest import candidate_words, ingest_words, validate_word
+from phrases import mine_phrases, validate_phrase
+from ranking import rank_dictionary, word_frequencies
+from dictview import BY_CODE, BY_WORD, DictionaryIndex
+from metrics import Metrics
+
+DATABASE_PATH = "database.txt"
 
 # Function to load the dictionary
 def load_dictionary():
-    if not os.path.exists("database.txt"):
-        with open("database.txt", "w") as file:
-            file.write("")
+    if not os.path.exists(DATABASE_PATH):
+        write_dictionary({}, DATABASE_PATH)
         return {}
-    dictionary = {}
-    with open("database.txt", "r") as file:
-        for line in file:
-            line = line.strip()
-            if line:
-                word, code = line.split(": ")
-                dictionary[word] = code
-    return dictionary
-
-# Function to save the dictionary
-def save_dictionary(dictionary):
-    with open("database.txt", "w") as file:
-        for word, code in dictionary.items():
-            file.write(f"{word}: {code}\n")
-
-# Function to generate a unique reference code
-def generate_reference_code(dictionary, used_special_chars):
-    code_length = 2  # Base code length (2 characters)
-    base_codes = ALLOWED_CHARS
-
-    while True:
-        if len(dictionary) >= calculate_max_codes():
-            raise Exception("Maximum dictionary capacity reached. Cannot generate new reference codes.")
-
-        # Cycle through special characters to balance usage
-        for special_character, position in SPECIAL_CHARACTERS.items():
-            # Generate base code
-            base_code = ''.join(random.choice(base_codes) for _ in range(code_length))
-
-            # Apply special character based on placement rule
-            if position == "front":
-                reference_code = special_character + base_code
-            elif position == "after":
-                reference_code = base_code + special_character
-            else:
-                raise ValueError(f"Invalid position '{position}' for special character '{special_character}'.")
+    return read_dictionary(DATABASE_PATH)
 
-            # Ensure uniqueness
-            if reference_code not in dictionary.values() and reference_code not in RESERVED_CODES:
-                return reference_code
+# Allocator tracking the codes already used by the loaded dictionary
+_allocator = None
 
-# Function to add a word
-def add_word(word):
-    try:
-        # Validate the word
-        if not word.isalpha() or len(word) < 4:
-            raise ValueError(f"Word '{word}' is invalid. Must be alphabetic and at least 4 characters long.")
-
-        # Check for duplicates
-        if word in dictionary:
-            raise ValueError(f"Word '{word}' already exists in the dictionary.")
-
-        # Check dictionary capacity
-        if len(dictionary) >= calculate_max_codes():
-            raise Exception("Dictionary is at maximum capacity. Cannot add new words.")
-
-        # Generate a unique reference code
-        reference_code = generate_reference_code(dictionary, SPECIAL_CHARACTERS)
-        dictionary[word] = reference_code
-        save_dictionary(dictionary)
-        update_display()
+# Stage timings, only when JACKRABBIT_METRICS is set (see metrics.py)
+METRICS = Metrics.from_environment()
 
-        # Success message
-        status_area.config(text=f"Success: '{word}' added with code '{reference_code}'.", fg="green")
+def get_allocator(dictionary):
+    """Returns the code allocator for this dictionary, building it on first use."""
+    global _allocator
+    if _allocator is None or _allocator.dictionary is not dictionary:
+        _allocator = CodeAllocator(dictionary.values())
+        _allocator.dictionary = dictionary
+    return _allocator
 
-    except Exception as e:
-        # Gracefully display error messages in the status area
-        status_area.config(text=f"Error: {str(e)}", fg="red")
+# Function to generate a unique reference code
+def generate_reference_code(dictionary, used_special_chars):
+    if len(dictionary) >= calculate_max_codes():
+        raise Exception("Maximum dictionary capacity reached. Cannot generate new reference codes.")
+    return get_allocator(dictionary).allocate()
+
+# Progress messages from the ingest worker, read on the GUI thread only
+progress_queue = queue.Queue()
+
+# Function to show a status message, with the metrics summary below it when metrics are on
+def show_status(message, summary, color="green"):
+    status_area.config(text=f"{message}\n{summary}" if summary else message, fg=color)
+
+# Only one worker at a time: each one reads the dictionary and writes database.txt
+busy = False
+
+# Function to enable or disable every button that starts a worker
+def set_busy(value):
+    global busy
+    busy = value
+    for button in (process_button, mine_button, rank_button):
+        button.config(state="disabled" if value else "normal")
+
+# Function to start a worker thread, unless one is still running
+def start_worker(target, args, message):
+    if busy:
+        status_area.config(text="Please wait until the current task has finished.", fg="red")
+        return
+    set_busy(True)
+    status_area.config(text=message, fg="black")
+    Thread(target=target, args=args, daemon=True).start()
+    root.after(50, poll_progress)
 
 # Function to process a paragraph of text
 def process_paragraph():
     paragraph = paragraph_entry.get("1.0", tk.END).strip()
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', paragraph)  # Extract words with 4 or more letters
+    words = candidate_words([paragraph])  # Unique words with 4 or more letters
 
     if not words:
         status_area.config(text="Error: No valid words found in the text.", fg="red")
         return
 
-    status_area.config(text=f"Processing {len(words)} words...", fg="black")
-    root.update_idletasks()  # Update the GUI
+    start_worker(ingest_worker, (words,), f"Processing {len(words)} words...")
 
-    for word in words:
-        add_word(word.lower())
-        time.sleep(0.1)  # Add a slight delay to prevent lag/crash
-        root.update_idletasks()  # Update the GUI after each word
+# Worker thread: allocates every code and writes database.txt once
+def ingest_worker(words, validate=validate_word):
+    measurement = METRICS.measure("ingest")
+    try:
+        with measurement.stage("ingest"):  # Allocating every code and writing the file once
+            added, skipped = ingest_words(dictionary, words, get_allocator(dictionary), DATABASE_PATH,
+                                          progress=lambda done, total: progress_queue.put(("progress", done, total)),
+                                          validate=validate)
+        measurement.count(candidates=len(words), added=len(added), skipped=len(skipped))
+        progress_queue.put(("done", added, skipped, measurement))
+    except Exception as e:
+        progress_queue.put(("error", str(e)))
 
-    status_area.config(text="Processing complete.", fg="green")
+# Function to apply worker messages to the widgets
+def poll_progress():
+    try:
+        while True:
+            message = progress_queue.get_nowait()
+            if message[0] == "progress":
+                status_area.config(text=f"Processing {message[1]}/{message[2]} words...", fg="black")
+            elif message[0] == "done":
+                added, skipped, measurement = message[1], message[2], message[3]
+                with measurement.stage("widgets"):
+                    dictionary.update(added)
+                    dictionary_view.add_many(added)
+                    update_capacity()
+                    set_busy(False)
+                measurement.count(entries=len(dictionary))
+                show_status(f"Processing complete: {len(added)} added, {len(skipped)} skipped.",
+                            METRICS.record(measurement))
+                return
+            elif message[0] == "ranked":
+                try:
+                    text, color = save_ranking(message[1])
+                except Exception as e:
+                    text, color = f"Error saving the ranked dictionary: {e}", "red"
+                finally:
+                    set_busy(False)
+                show_status(text, message[2], color)
+                return
+            else:
+                set_busy(False)
+                status_area.config(text=f"Error: {message[1]}", fg="red")
+                return
+    except queue.Empty:
+        pass
+    root.after(50, poll_progress)
+
+# Function to propose frequent phrases from the pasted text
+def mine_paragraph():
+    if busy:
+        status_area.config(text="Please wait until the current task has finished.", fg="red")
+        return
+    paragraph = paragraph_entry.get("1.0", tk.END).strip()
+    candidates = mine_phrases(paragraph.splitlines(), dictionary, min_count=2)
+    if not candidates:
+        status_area.config(text="No repeated phrases worth a code were found.", fg="blue")
+        return
+
+    window = tk.Toplevel(root)
+    window.title("Phrase Proposals")
+    tk.Label(window, text="Select phrases to add (saving = characters saved in this text):").pack(padx=10, pady=5)
+    listbox = tk.Listbox(window, selectmode=tk.MULTIPLE, width=60, height=15)
+    listbox.pack(padx=10, pady=5)
+    for candidate in candidates:
+        listbox.insert(tk.END, f"{candidate.phrase}  (x{candidate.count}, saving {candidate.saving})")
+
+    def add_selected():
+        phrases = [candidates[index].phrase for index in listbox.curselection()]
+        window.destroy()
+        if phrases:
+            # Another worker may have started while the proposals were open
+            start_worker(ingest_worker, (phrases, validate_phrase), f"Adding {len(phrases)} phrases...")
+
+    tk.Button(window, text="Add Selected", command=add_selected).pack(pady=10)
+
+# Function to re-assign codes by word frequency in a usage corpus
+def rank_by_frequency():
+    corpus_files = filedialog.askopenfilenames(title="Select Corpus / Message History",
+                                               filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+    if not corpus_files:
+        return
+    start_worker(ranking_worker, (corpus_files,), f"Counting words in {len(corpus_files)} files...")
+
+# Worker thread: counts the corpus and computes the ranked dictionary
+def ranking_worker(corpus_files):
+    try:
+        measurement = METRICS.measure("rank")
+        with measurement.stage("count"):
+            frequencies = word_frequencies(file_lines(corpus_files))
+        with measurement.stage("rank"):
+            result = rank_dictionary(dictionary, frequencies)
+        measurement.count(files=len(corpus_files), distinct_words=len(frequencies), entries=len(result.dictionary))
+        progress_queue.put(("ranked", result, METRICS.record(measurement)))
+    except Exception as e:
+        progress_queue.put(("error", str(e)))
+
+# Function to save a ranked dictionary (new file, or over database.txt); returns the status text and colour
+def save_ranking(result):
+    global _allocator
+    output_file = filedialog.asksaveasfilename(title="Save Ranked Dictionary", defaultextension=".txt",
+                                               filetypes=[("Text Files", "*.txt")])
+    if not output_file:
+        return f"Not saved. {result.summary()}", "blue"
+    write_dictionary(result.dictionary, output_file)
+    if os.path.abspath(output_file) == os.path.abspath(DATABASE_PATH):
+        dictionary.clear()
+        dictionary.update(result.dictionary)
+        _allocator = None  # Codes were re-assigned, rebuild the free pools
+        update_display()
+    return f"Saved to {output_file}. {result.summary()}", "green"
+
+# =============================================
+# DICTIONARY VIEW
+# =============================================
+class DictionaryView(tk.Frame):
+    """Searchable list that only ever holds the rows currently on screen."""
+
+    def __init__(self, parent, rows=15, width=50):
+        super().__init__(parent)
+        self.index = DictionaryIndex()
+        self.rows = rows
+        self.top = 0               # First row shown, relative to the search range
+        self.range = (0, 0)        # Rows of the index matching the search
+        self.by = BY_WORD
+
+        search_frame = tk.Frame(self)
+        search_frame.pack(fill=tk.X)
+        tk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.query = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=self.query, width=20)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind("<KeyRelease>", lambda event: self.search())
+        self.mode = tk.StringVar(value=BY_WORD)
+        tk.Radiobutton(search_frame, text="word", variable=self.mode, value=BY_WORD,
+                       command=self.search).pack(side=tk.LEFT)
+        tk.Radiobutton(search_frame, text="code", variable=self.mode, value=BY_CODE,
+                       command=self.search).pack(side=tk.LEFT)
+        self.count_label = tk.Label(search_frame, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        self.listbox = tk.Listbox(self, height=rows, width=width, activestyle="none")
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(sequence, self.on_wheel)
+
+    @property
+    def total(self):
+        return self.range[1] - self.range[0]
+
+    def load(self, dictionary):
+        """Full rebuild, for a new or re-coded dictionary."""
+        self.index.rebuild(dictionary)
+        self.search()
+
+    def add_many(self, pairs):
+        """New entries: updates the indexes and redraws at most the visible rows."""
+        self.index.add_many(pairs)
+        self.search(keep_position=True)
+
+    def search(self, keep_position=False):
+        self.by = self.mode.get()
+        self.range = self.index.search(self.query.get(), self.by)
+        if not keep_position:
+            self.top = 0
+        self.render()
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, self.total - self.rows))
+        self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.top - 3)
+        else:
+            self.scroll_to(self.top + 3)
+        return "break"
+
+    def render(self):
+        self.top = max(0, min(self.top, self.total - self.rows))
+        first = self.range[0] + self.top
+        last = min(first + self.rows, self.range[1])
+        self.listbox.delete(0, tk.END)
+        for index in range(first, last):
+            word, code = self.index.row(index, self.by)
+            self.listbox.insert(tk.END, f"{word}: {code}" if self.by == BY_WORD else f"{code}: {word}")
+        if self.total:
+            self.scrollbar.set(self.top / self.total, (self.top + last - first) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{self.total} of {len(self.index)}")
 
 # Function to update the display of the dictionary
 def update_display():
-    dictionary_display.delete(1.0, tk.END)
-    for word, code in dictionary.items():
-        dictionary_display.insert(tk.END, f"{word}: {code}\n")
+    dictionary_view.load(dictionary)
+    update_capacity()
+
+# Function to show the remaining codes per special character
+def update_capacity():
+    allocator = get_allocator(dictionary)
+    capacity_area.config(text=f"Free codes: {allocator.total_remaining()}\n{capacity_report(allocator)}")
 
 # Function to clear the input text window
 def clear_input():
     paragraph_entry.delete("1.0", tk.END)
     status_area.config(text="Input cleared.", fg="blue")
 
-# GUI Setup
-root = tk.Tk()
-root.title("Dictionary Manager v6")
+if __name__ == "__main__":
+    # GUI Setup
+    root = tk.Tk()
+    root.title("Dictionary Manager v6")
+
+    # Create and place the widgets
+    tk.Label(root, text="Paste a paragraph of text:").grid(row=0, column=0, padx=10, pady=10)
+    paragraph_entry = tk.Text(root, width=50, height=10)
+    paragraph_entry.grid(row=0, column=1, columnspan=2, padx=10, pady=10)
 
-# Create and place the widgets
-tk.Label(root, text="Paste a paragraph of text:").grid(row=0, column=0, padx=10, pady=10)
-paragraph_entry = tk.Text(root, width=50, height=10)
-paragraph_entry.grid(row=0, column=1, columnspan=2, padx=10, pady=10)
+    process_button = tk.Button(root, text="Process Paragraph", command=process_paragraph)
+    process_button.grid(row=1, column=1, padx=10, pady=10)
 
-process_button = tk.Button(root, text="Process Paragraph", command=lambda: Thread(target=process_paragraph).start())
-process_button.grid(row=1, column=1, padx=10, pady=10)
+    mine_button = tk.Button(root, text="Mine Phrases", command=mine_paragraph)
+    mine_button.grid(row=1, column=0, padx=10, pady=10)
 
-# Add the Clear button
-clear_button = tk.Button(root, text="Clear", command=clear_input)
-clear_button.grid(row=1, column=2, padx=10, pady=10)
+    rank_button = tk.Button(root, text="Rank by Frequency", command=rank_by_frequency)
+    rank_button.grid(row=1, column=3, padx=10, pady=10)
 
-# Status area for messages
-status_area = tk.Label(root, text="", fg="black", wraplength=300)
-status_area.grid(row=2, column=0, columnspan=3, padx=10, pady=10)
+    # Add the Clear button
+    clear_button = tk.Button(root, text="Clear", command=clear_input)
+    clear_button.grid(row=1, column=2, padx=10, pady=10)
 
-tk.Label(root, text="Dictionary:").grid(row=3, column=0, padx=10, pady=10)
-dictionary_display = tk.Text(root, width=50, height=15)
-dictionary_display.grid(row=3, column=1, columnspan=2, padx=10, pady=10)
+    # Status area for messages
+    status_area = tk.Label(root, text="", fg="black", wraplength=300)
+    status_area.grid(row=2, column=0, columnspan=3, padx=10, pady=10)
 
-# Initialize the dictionary display
-dictionary = load_dictionary()
-update_display()
+    tk.Label(root, text="Dictionary:").grid(row=3, column=0, padx=10, pady=10)
+    dictionary_view = DictionaryView(root)
+    dictionary_view.grid(row=3, column=1, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+    # Remaining capacity per special character family
+    capacity_area = tk.Label(root, text="", fg="black", justify=tk.LEFT)
+    capacity_area.grid(row=3, column=3, padx=10, pady=10, sticky="n")
+
+    # Initialize the dictionary display
+    measurement = METRICS.measure("load_dictionary")
+    with measurement.stage("read"):
+        dictionary = load_dictionary()
+    with measurement.stage("widgets"):
+        update_display()
+    measurement.count(entries=len(dictionary))
+    summary = METRICS.record(measurement)
+    if summary:
+        status_area.config(text=f"Dictionary loaded: {summary}", fg="blue")
 
-# Start the main loop
-root.mainloop()
\ No newline at end of file
+    # Start the main loop
+    root.mainloop()
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""Subword units and what word composition saves.
+
+The encoder already composes missing words from dictionary words and
+literal letters (see Composer in codec.py). Subword units are dictionary
+entries like "-ation: X1@" that exist only to be used as pieces: common
+endings that are not words by themselves. This module proposes units,
+from a built-in list of endings or mined from a corpus, adds them like
+phrases, and measures the payload saved by composition.
+"""
+from collections import Counter
+
+from allocator import CODE_LENGTH
+from codec import UNIT_PREFIX
+from ingest import ingest_words
+from ranking import word_frequencies
+
+# Endings long enough to be worth a 3-character code
+COMMON_ENDINGS = (
+    "ation", "ations", "ition", "itions", "ment", "ments", "ness", "nesses", "ings", "ingly",
+    "ably", "ibly", "ally", "ically", "ously", "fully", "lessly", "ities", "ization", "izations",
+    "ised", "ized", "izing", "ising", "ship", "ships", "hood", "ward", "wards", "ance", "ence",
+)
+
+def validate_unit(unit, dictionary):
+    """Returns why a unit cannot be added, or None if it can."""
+    letters = unit[len(UNIT_PREFIX):] if unit.startswith(UNIT_PREFIX) else ''
+    if not letters.isalpha() or len(letters) <= CODE_LENGTH:
+        return f"Unit '{unit}' is invalid. Must be '{UNIT_PREFIX}' followed by more than {CODE_LENGTH} letters."
+    if unit in dictionary:
+        return f"Unit '{unit}' already exists in the dictionary."
+    return None
+
+def add_units(dictionary, units, allocator, path, progress=None):
+    """Allocates codes for units and writes the dictionary once (see ingest_words)."""
+    units = [unit if unit.startswith(UNIT_PREFIX) else UNIT_PREFIX + unit for unit in units]
+    return ingest_words(dictionary, units, allocator, path, progress, validate=validate_unit)
+
+def mine_units(texts, reference, top=25):
+    """Endings of missing words, after their longest dictionary prefix, by characters a code would save."""
+    counts = Counter()
+    for word, count in word_frequencies(texts).items():
+        if word in reference or not word.isalpha():
+            continue
+        for cut in range(len(word) - 1, 1, -1):
+            if reference.get(word[:cut]) is not None:
+                ending = word[cut:]
+                if (len(ending) > CODE_LENGTH and reference.get(ending) is None
+                        and reference.get(UNIT_PREFIX + ending) is None):
+                    counts[ending] += count
+                break
+    savings = [(ending, count * (len(ending) - CODE_LENGTH)) for ending, count in counts.items()]
+    savings.sort(key=lambda item: (-item[1], item[0]))
+    return savings[:top]
+
+# =============================================
+# SAVINGS REPORT
+# =============================================
+class CompositionReport:
+    def __init__(self, words, missing_before, missing_after, plain, before, after):
+        self.words = words                    # Words in the corpus
+        self.missing_before = missing_before  # Sent verbatim without composition
+        self.missing_after = missing_after    # ... and with it
+        self.plain = plain                    # Characters of the corpus, one space between words
+        self.before = before                  # Payload characters without composition
+        self.after = after                    # ... and with it
+
+    def summary(self):
+        saved = (1 - self.after / self.before) * 100 if self.before else 0.0
+        return (f"{self.words} words, {self.missing_before} -> {self.missing_after} sent verbatim. "
+                f"Payload {self.before} -> {self.after} characters ({saved:.1f}% smaller; plain text {self.plain}).")
+
+def composition_report(codec, texts):
+    """Payload of a corpus encoded with and without word composition."""
+    reference = codec.reference
+    words = missing_before = missing_after = plain = before = after = 0
+    for text in texts:
+        tokens = codec.tokenize(text, reference)
+        if not tokens:
+            continue
+        words += len(tokens)
+        plain += len(' '.join(text.split()))
+        missing_before += sum(1 for token in tokens if token.span == 1 and reference.get(token.cleaned) is None)
+        missing_after += sum(1 for token in tokens if token.span == 1 and token.code is None)
+        before += len(codec.substitute(text, reference, compose=False)[0])
+        after += len(codec.substitute_tokens(tokens)[0])
+    return CompositionReport(words, missing_before, missing_after, plain, before, after)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""Reference code allocation for the Dictionary Manager.
+
+Codes are a 2-character base plus one special character, placed in front
+of or after the base depending on the character. Every family keeps a
+pre-shuffled pool of free codes, so handing out a code is a pop instead
+of random guessing against every code already in the dictionary.
+"""
+import random
+
+from codec import ALLOWED_CHARS
+
+# Reserved reference codes (common 2-letter English words)
+RESERVED_CODES = {
+    "WE", "SO", "BE", "IT", "DO", "AT", "IN", "OK", "TV", "PC", "FM", "AI", "AP",
+    "IQ", "DJ", "CD", "ID", "HI", "IF", "IS", "IR", "ON", "BY", "TO", "OF", "OR",
+    "AN", "AS", "MY", "UP", "HE", "GO", "NO", "US", "AM", "ME"
+}
+
+# Special characters rules
+SPECIAL_CHARACTERS = {
+    "$": "front",
+    "%": "front",
+    "@": "after",
+    "#": "after",
+    "&": "after",
+    "~": "front",  # ~ always in front
+    "{": "after",  # { always after the base code
+    "}": "front",  # } always in front
+    "[": "after",  # [ always after the base code
+    "]": "front",  # ] always in front
+    "^": "front",  # ^ always in front
+}
+
+CHAR_SET_LENGTH = len(ALLOWED_CHARS)
+CODE_LENGTH = 3  # Every code the allocator hands out: base code plus special character
+BASE_CODES = [a + b for a in ALLOWED_CHARS for b in ALLOWED_CHARS]
+BASE_CODES_SET = set(BASE_CODES)
+
+# Function to calculate maximum unique codes
+def calculate_max_codes():
+    base_codes = CHAR_SET_LENGTH ** 2  # Two-character base codes
+    special_codes = len(SPECIAL_CHARACTERS) * base_codes
+    return special_codes - len(RESERVED_CODES)
+
+def make_code(special_character, base_code):
+    """Applies the placement rule of a special character to a base code."""
+    position = SPECIAL_CHARACTERS[special_character]
+    if position == "front":
+        return special_character + base_code
+    if position == "after":
+        return base_code + special_character
+    raise ValueError(f"Invalid position '{position}' for special character '{special_character}'.")
+
+def code_family(code):
+    """Special character whose placement rule produced this code, or None."""
+    if len(code) != 3:
+        return None
+    if SPECIAL_CHARACTERS.get(code[0]) == "front" and code[1:] in BASE_CODES_SET:
+        return code[0]
+    if SPECIAL_CHARACTERS.get(code[-1]) == "after" and code[:2] in BASE_CODES_SET:
+        return code[-1]
+    return None
+
+class CapacityError(Exception):
+    """Raised when every code of every family is taken."""
+
+class CodeAllocator:
+    """Hands out unused reference codes in O(1).
+
+    used keeps every code known to be taken; each family has a shuffled
+    list of candidates that is popped from the end, skipping any code
+    that is already taken.
+    """
+
+    def __init__(self, used_codes=(), rng=None):
+        self.rng = rng or random.Random()
+        self.used = set(used_codes) | RESERVED_CODES
+        self._pools = {}
+        self._free = {}
+        for special_character in SPECIAL_CHARACTERS:
+            pool = [code for code in (make_code(special_character, base) for base in BASE_CODES)
+                    if code not in self.used]
+            self.rng.shuffle(pool)
+            self._pools[special_character] = pool
+            self._free[special_character] = len(pool)
+
+    def allocate(self, family=None):
+        """Returns a free code, from the given family or the one with the most free codes."""
+        if family is None:
+            family = max(self._free, key=self._free.get)
+        pool = self._pools[family]
+        while pool:
+            code = pool.pop()
+            if code not in self.used:
+                self.used.add(code)
+                self._free[family] -= 1
+                return code
+        raise CapacityError("Maximum dictionary capacity reached. Cannot generate new reference codes.")
+
+    def release(self, code):
+        """Returns a code to its pool, e.g. after a word was removed."""
+        if code not in self.used or code in RESERVED_CODES:
+            return
+        self.used.discard(code)
+        family = code_family(code)
+        if family is None:
+            return
+        pool = self._pools[family]
+        pool.append(code)
+        # Swap into a random slot so released codes are not handed out first
+        index = self.rng.randrange(len(pool))
+        pool[index], pool[-1] = pool[-1], pool[index]
+        self._free[family] += 1
+
+    def remaining(self):
+        """Free codes left per special-character family."""
+        return dict(self._free)
+
+    def total_remaining(self):
+        return sum(self._free.values())
+
+def capacity_report(allocator):
+    """One line per family, e.g. '$ (front): 1234 free'."""
+    return "\n".join(f"{special_character} ({SPECIAL_CHARACTERS[special_character]}): {free} free"
+                     for special_character, free in allocator.remaining().items())
\ No newline at end of file
@@ -0,0 +1,338 @@
+"""Headless benchmarks for the JackRabbit hot paths.
+
+Run from this folder:
+
+    python benchmark.py cipher --sizes 1000 100000 1000000
+    python benchmark.py suite --save-baseline baseline.json
+    python benchmark.py suite --baseline baseline.json
+
+The suite builds synthetic dictionaries (1k words up to the
+calculate_max_codes() ceiling) and message corpora in a temporary
+folder and times loading, bulk fill, adding words, reloading, shuffling
+and encoding/decoding, and records the payload compression ratio. With
+--baseline it exits with status 1 when a result is worse than the
+baseline by more than the threshold. Baselines are only comparable on
+the machine that recorded them.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from allocator import CodeAllocator, calculate_max_codes
+from codec import (ALLOWED_CHARS, CHAR_SET_LENGTH, Codec, read_dictionary, write_dictionary,
+                   vigenere_like_encrypt, vigenere_like_decrypt)
+from dictcache import open_compiled, open_tables, rebuild_cache
+from dictview import DictionaryIndex
+from ingest import ingest_words
+from keyed import KeyedDictionary
+from reloader import DictionaryReloader
+
+try:
+    # The GUI modules import tkinter at the top; their helpers are used when it is there
+    from Managerv6 import generate_reference_code
+    from shufflev2 import shuffle_dictionary
+except ImportError:
+    generate_reference_code = shuffle_dictionary = None
+
+# =============================================
+# REFERENCE IMPLEMENTATIONS (JackRabbit v5)
+# =============================================
+def legacy_encrypt(text, key):
+    """Per-character cipher exactly as shipped in JackRabbit v5."""
+    key = (key * (len(text) // len(key) + 1))[:len(text)]
+    encrypted = []
+    for t, k in zip(text, key):
+        if t in ALLOWED_CHARS and k.upper() in ALLOWED_CHARS:
+            t_index = ALLOWED_CHARS.index(t)
+            k_index = ALLOWED_CHARS.index(k.upper())
+            encrypted.append(ALLOWED_CHARS[(t_index + k_index) % CHAR_SET_LENGTH])
+        else:
+            encrypted.append(t)
+    return ''.join(encrypted)
+
+def legacy_decrypt(text, key):
+    """Per-character decipher exactly as shipped in JackRabbit v5."""
+    key = (key * (len(text) // len(key) + 1))[:len(text)]
+    decrypted = []
+    for t, k in zip(text, key):
+        if t in ALLOWED_CHARS and k.upper() in ALLOWED_CHARS:
+            t_index = ALLOWED_CHARS.index(t)
+            k_index = ALLOWED_CHARS.index(k.upper())
+            decrypted.append(ALLOWED_CHARS[(t_index - k_index) % CHAR_SET_LENGTH])
+        else:
+            decrypted.append(t)
+    return ''.join(decrypted)
+
+# =============================================
+# SYNTHETIC DATA
+# =============================================
+PAYLOAD_ALPHABET = ALLOWED_CHARS * 4 + "     @$#%&~{}[]^.,?"
+
+def synthetic_payload(size, seed=0):
+    """Uppercase payload with spaces and special characters mixed in."""
+    rng = random.Random(seed)
+    return ''.join(rng.choice(PAYLOAD_ALPHABET) for _ in range(size))
+
+SYLLABLES = [c + v for c in "bcdfghklmnprstvwz" for v in "aeiou"]
+ENDINGS = ("s", "ed", "ing", "ness", "ly")
+
+def synthetic_words(count, seed=0):
+    """Distinct pronounceable lowercase words of 4 to 8 letters."""
+    rng = random.Random(seed)
+    words = {}
+    while len(words) < count:
+        words.setdefault(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))), None)
+    return list(words)
+
+def synthetic_dictionary(size, seed=0):
+    allocator = CodeAllocator(rng=random.Random(seed))
+    return {word: allocator.allocate() for word in synthetic_words(size, seed)}
+
+def synthetic_corpus(words, count, seed=0, missing=0.1):
+    """Text of count words drawn with a Zipf-like skew from words.
+
+    A fraction of the words get an ending so they are not in the
+    dictionary, and some sentences end with punctuation.
+    """
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    picked = rng.choices(words, weights, k=count)
+    text = []
+    for word in picked:
+        if rng.random() < missing:
+            word += rng.choice(ENDINGS)
+        if rng.random() < 0.08:
+            word += rng.choice(".,?")
+        text.append(word)
+    return ' '.join(text)
+
+def best_of(function, *args, repeat=3):
+    """Best wall time of a few runs, with the result of the last one."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+# =============================================
+# BENCHMARKS
+# =============================================
+def bench_cipher(sizes, key, repeat):
+    print(f"{'size':>10} {'op':>8} {'legacy MB/s':>12} {'table MB/s':>12} {'speedup':>8}")
+    for size in sizes:
+        text = synthetic_payload(size)
+        for name, legacy, table in (("encrypt", legacy_encrypt, vigenere_like_encrypt),
+                                    ("decrypt", legacy_decrypt, vigenere_like_decrypt)):
+            legacy_time, expected = best_of(legacy, text, key, repeat=repeat)
+            table_time, result = best_of(table, text, key, repeat=repeat)
+            if result != expected:
+                raise SystemExit(f"Output mismatch for {name} at size {size}.")
+            megabytes = size / 1e6
+            print(f"{size:>10} {name:>8} {megabytes / legacy_time:>12.2f} "
+                  f"{megabytes / table_time:>12.2f} {legacy_time / table_time:>7.1f}x")
+
+# =============================================
+# SUITE
+# =============================================
+DEFAULT_DICTIONARY_SIZES = [1000, 5000, calculate_max_codes()]
+DEFAULT_CORPUS_WORDS = [100, 1000, 10_000]
+DEFAULT_THRESHOLD = 0.25        # Timings may grow by this fraction before a run fails
+DEFAULT_RATIO_THRESHOLD = 0.01  # Compression ratios may grow by this fraction
+MIN_TIME = 0.005  # Shorter timings are mostly noise and compared as if they took this long
+ADD_WORD_SAMPLE = 50  # Words added one by one, each followed by a save
+PASSWORD = "PASSWORD"
+SEED = "benchmark seed"
+
+def fill_codes(words):
+    """Bulk fill through generate_reference_code, the Manager's per-word allocator."""
+    dictionary = {}
+    if generate_reference_code is not None:
+        for word in words:
+            dictionary[word] = generate_reference_code(dictionary, None)
+    else:
+        allocator = CodeAllocator()
+        for word in words:
+            dictionary[word] = allocator.allocate()
+    return dictionary
+
+def add_words_one_by_one(dictionary, words, path):
+    """Adds words one at a time, each saved on its own: allocate, index, save."""
+    dictionary = dict(dictionary)
+    allocator = CodeAllocator(dictionary.values())
+    index = DictionaryIndex(dictionary)
+    for word in words:
+        code = allocator.allocate()
+        dictionary[word] = code
+        index.add(word, code)
+        write_dictionary(dictionary, path)
+
+def headless_shuffle(file_path):
+    """shufflev2.shuffle_dictionary without its error dialog."""
+    dictionary = read_dictionary(file_path)
+    keys = list(dictionary.keys())
+    values = list(dictionary.values())
+    random.shuffle(keys)
+    random.shuffle(values)
+    return {keys[i]: values[i] for i in range(len(keys))}
+
+def time_reload(path, dictionary, repeat):
+    """Best latency of DictionaryReloader.reload() after one word was added to the file."""
+    codec = Codec(path)
+    reloader = DictionaryReloader(codec)
+    reloader.reload()
+    best = None
+    extra = synthetic_words(repeat, seed=1)
+    for i in range(repeat):
+        updated = dict(dictionary)
+        updated["zz" + extra[i]] = "~~~"
+        write_dictionary(updated, path)
+        start = time.perf_counter()
+        diff = reloader.reload()
+        elapsed = time.perf_counter() - start
+        if not diff:
+            raise SystemExit("The reloader did not pick up the change.")
+        best = elapsed if best is None else min(best, elapsed)
+    write_dictionary(dictionary, path)
+    return best
+
+def run_suite(sizes, corpus_words, repeat, log=print):
+    """Runs every benchmark; returns {name: {"value": ..., "unit": "s" or "ratio"}}."""
+    results = {}
+
+    def record(name, value, unit="s"):
+        results[name] = {"value": value, "unit": unit}
+        log(f"{name:<28} {value * 1000:>10.2f} ms" if unit == "s" else f"{name:<28} {value:>10.4f}")
+
+    shuffle = shuffle_dictionary or headless_shuffle
+    with tempfile.TemporaryDirectory() as folder:
+        dictionary = {}
+        path = None
+        for size in sizes:
+            dictionary = synthetic_dictionary(size)
+            words = list(dictionary)
+            path = os.path.join(folder, f"dictionary{size}.txt")
+            write_dictionary(dictionary, path)
+            text_codec = Codec(path, compiled=False)
+            record(f"load/text/{size}", best_of(text_codec.load, repeat=repeat)[0])
+            record(f"load/compiled_cold/{size}", best_of(lambda: open_tables(rebuild_cache(path)), repeat=repeat)[0])
+            record(f"load/compiled_warm/{size}", best_of(open_compiled, path, repeat=repeat)[0])
+            record(f"fill/generate/{size}", best_of(fill_codes, words, repeat=repeat)[0])
+            ingest_path = os.path.join(folder, "ingest.txt")
+            record(f"fill/ingest/{size}", best_of(lambda: ingest_words({}, words, CodeAllocator(), ingest_path),
+                                                  repeat=repeat)[0])
+            sample = min(ADD_WORD_SAMPLE, size // 2)
+            base = {word: dictionary[word] for word in words[:size - sample]}
+            add_path = os.path.join(folder, "add.txt")
+            add_time = best_of(add_words_one_by_one, base, words[size - sample:], add_path, repeat=repeat)[0]
+            record(f"add_word/{size}", add_time / sample)
+            record(f"reload/{size}", time_reload(path, dictionary, repeat))
+            record(f"shuffle/random/{size}", best_of(shuffle, path, repeat=repeat)[0])
+            record(f"shuffle/keyed/{size}",
+                   best_of(lambda: KeyedDictionary(dictionary, SEED).materialize(), repeat=repeat)[0])
+
+        # Messages are encoded with the largest dictionary
+        codec = Codec(path)
+        codec.load()
+        words = list(dictionary)
+        size = len(words)
+        for count in corpus_words:
+            text = synthetic_corpus(words, count)
+            encode_time, payload = best_of(codec.encode, text, PASSWORD, repeat=repeat)
+            decode_time, _ = best_of(codec.decode, payload, PASSWORD, repeat=repeat)
+            record(f"encode/{size}/{count}", encode_time)
+            record(f"decode/{size}/{count}", decode_time)
+            record(f"ratio/{size}/{count}", len(payload) / len(text), unit="ratio")
+    return results
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, ratio_threshold=DEFAULT_RATIO_THRESHOLD):
+    """(name, baseline, current) for every result worse than the baseline allows.
+
+    Higher is worse for both timings and ratios (payload / plain text).
+    Results missing from either side are not compared.
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if result["unit"] == "s":
+            allowed = max(old["value"], MIN_TIME) * (1 + threshold)
+        else:
+            allowed = old["value"] * (1 + ratio_threshold)
+        if result["value"] > allowed:
+            regressions.append((name, old["value"], result["value"]))
+    return regressions
+
+def read_baseline(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+def write_results(path, results, sizes, corpus_words):
+    data = {"created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "corpus_words": corpus_words,
+            "shuffle": "shufflev2" if shuffle_dictionary is not None else "headless",
+            "results": results}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+def suite(args):
+    max_codes = calculate_max_codes()
+    sizes = sorted(set(args.sizes))
+    if sizes[0] < 2 or sizes[-1] > max_codes:
+        raise SystemExit(f"Dictionary sizes must be between 2 and {max_codes}.")
+    if shuffle_dictionary is None:
+        print("tkinter is not available: timing the Manager and Shuffler helpers through headless equivalents.")
+    results = run_suite(sizes, args.corpus_words, args.repeat)
+    if args.save_baseline:
+        write_results(args.save_baseline, results, sizes, args.corpus_words)
+        print(f"Saved {len(results)} results to {args.save_baseline}.")
+    if args.baseline:
+        regressions = compare(results, read_baseline(args.baseline), args.threshold, args.ratio_threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old:.6g} -> {new:.6g} ({(new / old - 1) * 100 if old else 0:+.1f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}.")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JackRabbit benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    cipher = subparsers.add_parser("cipher", help="table-driven cipher vs the v5 per-character cipher")
+    cipher.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    cipher.add_argument("--key", default="PASSWORD")
+    cipher.add_argument("--repeat", type=int, default=3)
+
+    bench = subparsers.add_parser("suite", help="dictionary, fill, reload, shuffle and codec benchmarks")
+    bench.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_DICTIONARY_SIZES,
+                       help="dictionary sizes in words")
+    bench.add_argument("--corpus-words", type=int, nargs="+", default=DEFAULT_CORPUS_WORDS,
+                       help="message corpus sizes in words")
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.add_argument("--baseline", help="compare with this results file and fail on regressions")
+    bench.add_argument("--save-baseline", metavar="FILE", help="write the results to this file")
+    bench.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="allowed slowdown as a fraction (default %(default)s)")
+    bench.add_argument("--ratio-threshold", type=float, default=DEFAULT_RATIO_THRESHOLD,
+                       help="allowed compression ratio growth as a fraction (default %(default)s)")
+
+    args = parser.parse_args(argv)
+    if args.command == "cipher":
+        bench_cipher(args.sizes, args.key, args.repeat)
+    elif args.command == "suite":
+        return suite(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
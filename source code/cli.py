@@ -0,0 +1,398 @@
+"""JackRabbit command line.
+
+Streams files, pipes or stdin through the codec without a GUI:
+
+    python cli.py encrypt -i message.txt -o payload.txt
+    type archive.txt | python cli.py decrypt --password secret --stats
+"""
+import argparse
+import getpass
+import json
+import os
+import sys
+import time
+
+from codec import Codec, DEFAULT_CHUNK_SIZE, DEFAULT_DATABASE_PATH, file_lines, iter_chunks, read_dictionary, write_dictionary
+from allocator import CodeAllocator, capacity_report
+from ingest import ingest_files
+from dictcache import cache_path_for, rebuild_cache
+from phrases import add_phrases, format_report, mine_phrases, payload_report
+from ranking import rank_dictionary, word_frequencies
+from keyed import KeyedDictionary
+from patch import apply_patch, dictionary_version, make_patch
+from js8bridge import DEFAULT_HOST, JS8Bridge, ReplayServer
+from keyring import DEFAULT_KEYRING_PATH, Keyring, Profile
+from logtail import LogFollower
+from affixes import COMMON_ENDINGS, add_units, composition_report, mine_units
+
+# =============================================
+# HELPERS
+# =============================================
+def open_input(path):
+    if path in (None, "-"):
+        return sys.stdin
+    return open(path, "r")
+
+def open_output(path):
+    if path in (None, "-"):
+        return sys.stdout
+    return open(path, "w")
+
+def read_password(args):
+    """Password from --password, the JACKRABBIT_PASSWORD variable or a prompt."""
+    password = args.password or os.environ.get("JACKRABBIT_PASSWORD") or getpass.getpass("Password: ")
+    password = password.strip()
+    if not password:
+        raise SystemExit("Error: a password is required.")
+    return password
+
+def read_seed(args):
+    """Dictionary seed from --seed or the JACKRABBIT_SEED variable; None for the plain file."""
+    return args.seed or os.environ.get("JACKRABBIT_SEED") or None
+
+class Throughput:
+    """Counts characters flowing through a chunk iterator."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.characters = 0
+        self.started = time.perf_counter()
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.characters += len(chunk)
+            yield chunk
+
+    def report(self, stream=sys.stderr):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        megabytes = self.characters / 1e6
+        print(f"{self.characters} characters in {elapsed:.3f} s ({megabytes / elapsed:.2f} MB/s)", file=stream)
+
+# =============================================
+# COMMANDS
+# =============================================
+def run_stream(args):
+    codec = Codec(args.dictionary, seed=read_seed(args))
+    password = read_password(args)
+    source = open_input(args.input)
+    target = open_output(args.output)
+    try:
+        chunks = Throughput(iter_chunks(source, args.chunk_size))
+        if args.command == "encrypt":
+            pieces = codec.encode_stream(chunks, password)
+        else:
+            pieces = codec.decode_stream(chunks, password)
+        for piece in pieces:
+            target.write(piece)
+        target.write("\n")  # End the output like print() does, so the shell prompt starts on its own line
+        target.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    if args.stats:
+        chunks.report()
+
+def run_capacity(args):
+    allocator = CodeAllocator(read_dictionary(args.dictionary).values())
+    print(f"Free codes: {allocator.total_remaining()}")
+    print(capacity_report(allocator))
+
+def run_ingest(args):
+    dictionary = read_dictionary(args.dictionary) if os.path.exists(args.dictionary) else {}
+    allocator = CodeAllocator(dictionary.values())
+    added, skipped = ingest_files(dictionary, args.files, allocator, args.dictionary)
+    print(f"{len(added)} words added, {len(skipped)} skipped.")
+    if args.verbose:
+        for word, reason in skipped:
+            print(f"  {reason}")
+
+def run_compile(args):
+    rebuild_cache(args.dictionary)
+    print(f"Compiled {args.dictionary} into {cache_path_for(args.dictionary)}")
+
+def read_lines(paths):
+    """Lines of the given files, or of stdin when there are none."""
+    return file_lines(paths) if paths else sys.stdin
+
+def run_phrases(args):
+    dictionary = read_dictionary(args.dictionary)
+    candidates = mine_phrases(read_lines(args.files), dictionary, max_words=args.max_words,
+                              min_count=args.min_count, top=args.top)
+    for candidate in candidates:
+        print(f"{candidate.saving:>8} {candidate.count:>6}  {candidate.phrase}")
+    if args.add and candidates:
+        allocator = CodeAllocator(dictionary.values())
+        added, _ = add_phrases(dictionary, [candidate.phrase for candidate in candidates[:args.add]],
+                               allocator, args.dictionary)
+        for phrase, code in added:
+            print(f"Added {phrase}: {code}")
+
+def run_report(args):
+    print(format_report(payload_report(Codec(args.dictionary, seed=read_seed(args)), read_lines(args.files))))
+
+def run_rank(args):
+    dictionary = read_dictionary(args.dictionary)
+    result = rank_dictionary(dictionary, word_frequencies(read_lines(args.files)), add_new_words=not args.keep_words)
+    print(result.summary())
+    if args.output:
+        write_dictionary(result.dictionary, args.output)
+        print(f"Ranked dictionary saved to {args.output}")
+
+def run_derive(args):
+    seed = read_seed(args) or getpass.getpass("Dictionary seed: ")
+    if not seed:
+        raise SystemExit("Error: a seed is required.")
+    keyed = KeyedDictionary(read_dictionary(args.dictionary), seed).materialize()
+    write_dictionary(keyed, args.output)
+    print(f"Keyed dictionary ({len(keyed)} entries) saved to {args.output}")
+
+def run_diff(args):
+    patch = make_patch(read_dictionary(args.old), read_dictionary(args.dictionary))
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(patch + "\n")
+        print(f"Patch ({len(patch)} characters) saved to {args.output}", file=sys.stderr)
+    else:
+        print(patch)
+
+def run_patch(args):
+    dictionary = read_dictionary(args.dictionary)
+    patched = apply_patch(dictionary, "".join(read_lines([args.patch] if args.patch else [])))
+    if patched == dictionary:
+        print(f"{args.dictionary} is already at version {dictionary_version(dictionary)}")
+        return
+    write_dictionary(patched, args.dictionary)
+    print(f"{args.dictionary} patched to version {dictionary_version(patched)} ({len(patched)} entries)")
+
+def run_affixes(args):
+    codec = Codec(args.dictionary, seed=read_seed(args))
+    texts = list(read_lines(args.files))
+    print(composition_report(codec, texts).summary())
+    proposals = mine_units(texts, codec.reference, top=args.top)
+    if proposals:
+        print("Endings worth a unit code (characters saved on this corpus):")
+        for ending, saving in proposals:
+            print(f"{saving:>8}  -{ending}")
+    units = [ending for ending, _ in proposals[:args.add]]
+    if args.add_common:
+        units.extend(ending for ending in COMMON_ENDINGS if ending not in units)
+    if units:
+        dictionary = read_dictionary(args.dictionary)
+        added, skipped = add_units(dictionary, units, CodeAllocator(dictionary.values()), args.dictionary)
+        print(f"{len(added)} units added, {len(skipped)} skipped.")
+        if added:
+            print(composition_report(Codec(args.dictionary, seed=read_seed(args)), texts).summary())
+
+def print_bridge_event(event):
+    kind, payload = event
+    if kind == "received":
+        text = payload.text if payload.text is not None else f"(not decoded) {payload.payload}"
+        print(f"{payload.sender} -> {payload.to}: {text}", flush=True)
+    elif kind == "sent":
+        print(f"sent to {payload[0]}: {payload[1]}", file=sys.stderr, flush=True)
+    else:
+        print(f"[{kind}] {payload or ''}", file=sys.stderr, flush=True)
+
+def run_bridge(args):
+    password = read_password(args)
+    bridge = JS8Bridge(Codec(args.dictionary, seed=read_seed(args)), lambda callsign: password,
+                       host=args.host, port=args.port, udp=args.udp, notify=print_bridge_event, record=args.record)
+    bridge.start()
+    print("Type 'CALLSIGN message' to send, Ctrl+D to quit.", file=sys.stderr)
+    try:
+        for line in sys.stdin:
+            to, _, text = line.strip().partition(" ")
+            if to and text:
+                bridge.send(text, to.upper(), password)
+    except KeyboardInterrupt:
+        pass
+    bridge.stop()
+
+def run_replay(args):
+    import asyncio
+    server = ReplayServer.from_file(args.recording, host=args.host, port=args.port, delay=args.delay,
+                                    callsign=args.callsign)
+    print(f"Replaying {len(server.messages)} messages on {args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+def print_log_entries(decoded, as_json=False):
+    for (callsign, timestamp), entry in sorted(decoded.items(), key=lambda item: (item[0][1], item[0][0])):
+        if as_json:
+            print(json.dumps({"callsign": callsign, "timestamp": timestamp, "to": entry.to, "payload": entry.payload,
+                              "text": entry.text, "corrections": entry.corrections}), flush=True)
+        else:
+            text = entry.text if entry.text is not None else f"(no password) {entry.payload}"
+            print(f"{timestamp} {callsign} -> {entry.to}: {text}", flush=True)
+
+def run_log(args):
+    follower = LogFollower(args.log, Keyring.load(args.keyring), args.dictionary, seed=read_seed(args),
+                           state_path=args.state, workers=args.workers)
+    if args.reset:
+        follower.reset()
+    if not args.follow:
+        print_log_entries(follower.poll(), args.json)
+        return
+    try:
+        for decoded in follower.follow():
+            print_log_entries(decoded, args.json)
+    except KeyboardInterrupt:
+        pass
+
+def run_keyring(args):
+    keyring = Keyring.load(args.keyring)
+    if args.action == "list":
+        if keyring.default:
+            print("(default)")
+        for callsign in sorted(keyring.contacts):
+            profile = keyring.assignments.get(callsign)
+            print(f"{callsign} [{profile}]" if profile else callsign)
+        for name, profile in sorted(keyring.profiles.items()):
+            members = sorted(call for call, assigned in keyring.assignments.items() if assigned == name)
+            print(f"profile {name}: {profile.dictionary}, password of {profile.password or 'default'}"
+                  f"{', seeded' if profile.seed else ''}; {', '.join(members) or 'no stations'}")
+        return
+    if not args.name:
+        raise SystemExit("Error: a callsign, 'default' or a profile name is required.")
+    if args.action == "profile":
+        if args.delete:
+            if not keyring.remove_profile(args.name):
+                raise SystemExit(f"Error: there is no profile named '{args.name}'.")
+        else:
+            if not args.profile_dictionary:
+                raise SystemExit("Error: --dictionary-file is required for a profile.")
+            keyring.add_profile(Profile(args.name, args.profile_dictionary, args.password_of, args.profile_seed))
+    elif args.action == "assign":
+        keyring.assign(args.name, args.profile)
+    elif args.action == "remove":
+        if args.name.lower() == "default":
+            keyring.default = None
+        elif not keyring.remove(args.name):
+            raise SystemExit(f"Error: {args.name.upper()} is not in the keyring.")
+    else:
+        password = read_password(args)
+        if args.name.lower() == "default":
+            keyring.default = password
+        else:
+            keyring.set(args.name, password)
+    keyring.save()
+    print(f"Keyring saved to {keyring.path}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="JackRabbit command line")
+    parser.add_argument("--dictionary", default=DEFAULT_DATABASE_PATH, help="dictionary file (default: database.txt next to this script)")
+    parser.add_argument("--seed", help="permute the dictionary with this shared passphrase (default: $JACKRABBIT_SEED)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("encrypt", "substitute and encrypt plaintext"),
+                            ("decrypt", "decrypt a payload and restore the words")):
+        stream = subparsers.add_parser(name, help=help_text)
+        stream.add_argument("-i", "--input", help="input file (default: stdin)")
+        stream.add_argument("-o", "--output", help="output file (default: stdout)")
+        stream.add_argument("-p", "--password", help="password (default: $JACKRABBIT_PASSWORD or a prompt)")
+        stream.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        stream.add_argument("--stats", action="store_true", help="report throughput on stderr")
+        stream.set_defaults(handler=run_stream)
+
+    capacity = subparsers.add_parser("capacity", help="free reference codes per special character")
+    capacity.set_defaults(handler=run_capacity)
+
+    ingest = subparsers.add_parser("ingest", help="add every new word of some text files to the dictionary")
+    ingest.add_argument("files", nargs="+")
+    ingest.add_argument("-v", "--verbose", action="store_true", help="list skipped words")
+    ingest.set_defaults(handler=run_ingest)
+
+    compile_cache = subparsers.add_parser("compile", help="rebuild the binary dictionary cache now")
+    compile_cache.set_defaults(handler=run_compile)
+
+    phrases = subparsers.add_parser("phrases", help="propose frequent phrases from a corpus")
+    phrases.add_argument("files", nargs="*", help="corpus files (default: stdin)")
+    phrases.add_argument("--max-words", type=int, default=4)
+    phrases.add_argument("--min-count", type=int, default=3)
+    phrases.add_argument("--top", type=int, default=25)
+    phrases.add_argument("--add", type=int, default=0, metavar="N", help="add the best N proposals to the dictionary")
+    phrases.set_defaults(handler=run_phrases)
+
+    report = subparsers.add_parser("report", help="payload size per message, with and without phrases")
+    report.add_argument("files", nargs="*", help="one message per line (default: stdin)")
+    report.set_defaults(handler=run_report)
+
+    rank = subparsers.add_parser("rank", help="give the shortest codes to the most frequent words of a corpus")
+    rank.add_argument("files", nargs="*", help="corpus / message history (default: stdin)")
+    rank.add_argument("-o", "--output", help="where to save the ranked dictionary (default: only print the gain)")
+    rank.add_argument("--keep-words", action="store_true", help="only re-code existing words, add nothing")
+    rank.set_defaults(handler=run_rank)
+
+    derive = subparsers.add_parser("derive", help="write the seed-permuted dictionary for peers without seed support")
+    derive.add_argument("-o", "--output", required=True)
+    derive.set_defaults(handler=run_derive)
+
+    diff = subparsers.add_parser("diff", help="JS8Call-safe patch from an older dictionary to --dictionary")
+    diff.add_argument("old", help="the dictionary version the peers have now")
+    diff.add_argument("-o", "--output", help="patch file (default: stdout)")
+    diff.set_defaults(handler=run_diff)
+
+    patch = subparsers.add_parser("patch", help="apply a received patch to --dictionary")
+    patch.add_argument("patch", nargs="?", help="patch file (default: stdin)")
+    patch.set_defaults(handler=run_patch)
+
+    affixes = subparsers.add_parser("affixes", help="payload saved by composing missing words, and subword units to add")
+    affixes.add_argument("files", nargs="*", help="sample corpus (default: stdin)")
+    affixes.add_argument("--top", type=int, default=15)
+    affixes.add_argument("--add", type=int, default=0, metavar="N", help="add the best N proposed units to the dictionary")
+    affixes.add_argument("--add-common", action="store_true", help="add the built-in list of common endings")
+    affixes.set_defaults(handler=run_affixes)
+
+    bridge = subparsers.add_parser("bridge", help="decode received and encode sent messages through the JS8Call API")
+    bridge.add_argument("--host", default=DEFAULT_HOST)
+    bridge.add_argument("--port", type=int, help="API port (default: 2442 for TCP, 2242 for UDP)")
+    bridge.add_argument("--udp", action="store_true", help="use the UDP API instead of TCP")
+    bridge.add_argument("-p", "--password", help="password (default: $JACKRABBIT_PASSWORD or a prompt)")
+    bridge.add_argument("--record", help="append the raw API traffic to this file, for replay")
+    bridge.set_defaults(handler=run_bridge)
+
+    replay = subparsers.add_parser("replay", help="stand-in JS8Call API server replaying recorded traffic")
+    replay.add_argument("recording", help="JSON lines, e.g. written by bridge --record")
+    replay.add_argument("--host", default=DEFAULT_HOST)
+    replay.add_argument("--port", type=int, default=2442)
+    replay.add_argument("--delay", type=float, default=1.0, help="seconds between messages")
+    replay.add_argument("--callsign", help="answer to give when asked for the station callsign")
+    replay.set_defaults(handler=run_replay)
+
+    log = subparsers.add_parser("log", help="decode a JS8Call DIRECTED.TXT, from where the last run stopped")
+    log.add_argument("log", help="path to DIRECTED.TXT")
+    log.add_argument("-f", "--follow", action="store_true", help="keep decoding new lines as they are logged")
+    log.add_argument("--keyring", default=DEFAULT_KEYRING_PATH, help="per-contact passwords (default: keyring.json)")
+    log.add_argument("--state", help="where to remember the read offset (default: <log>.jrpos)")
+    log.add_argument("--reset", action="store_true", help="decode the whole log again")
+    log.add_argument("--workers", type=int, help="decoding processes for a large backlog (default: one per CPU)")
+    log.add_argument("--json", action="store_true", help="one JSON object per message")
+    log.set_defaults(handler=run_log)
+
+    keyring = subparsers.add_parser("keyring", help="manage per-contact passwords and dictionary profiles")
+    keyring.add_argument("action", choices=("set", "remove", "list", "profile", "assign"))
+    keyring.add_argument("name", nargs="?", help="callsign or 'default' (set/remove/assign), profile name (profile)")
+    keyring.add_argument("-p", "--password", help="password for set (default: a prompt)")
+    keyring.add_argument("--keyring", default=DEFAULT_KEYRING_PATH)
+    keyring.add_argument("--dictionary-file", dest="profile_dictionary", help="profile: its dictionary file")
+    keyring.add_argument("--password-of", help="profile: keyring entry holding its password (default: 'default')")
+    keyring.add_argument("--profile-seed", help="profile: dictionary seed (see --seed)")
+    keyring.add_argument("--delete", action="store_true", help="profile: delete it")
+    keyring.add_argument("--profile", help="assign: profile to put the station on (omit for the default dictionary)")
+    keyring.set_defaults(handler=run_keyring)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
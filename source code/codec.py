@@ -0,0 +1,661 @@
+"""Headless JackRabbit codec.
+
+Holds the reference dictionary, the word substitution and the Vigenère-like
+cipher without any GUI dependency. Nothing is read from disk at import time:
+the dictionary is loaded the first time a Codec actually needs it.
+"""
+import os
+import re
+import shutil
+import string
+import tempfile
+from contextlib import contextmanager
+
+# Define the allowed character set (uppercase letters, numbers, and special characters)
+ALLOWED_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+SPECIAL_CHARS = ['@', '$', '#', '%', '&', '~', '{', '}', '[', ']', '^']
+CHAR_SET_LENGTH = len(ALLOWED_CHARS)
+
+DEFAULT_DATABASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database.txt")
+
+# Built once instead of once per word
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+# Punctuation that may end a word; a composed word loses it like a dictionary word does
+SENTENCE_END = ".,!?;:"
+
+# Same boundaries as str.split(): runs of non-whitespace
+TOKEN_PATTERN = re.compile(r'\S+')
+
+# ====================
+# DICTIONARY FILES
+# ====================
+def parse_dictionary(lines):
+    """Builds a word -> code dictionary from 'word: code' lines."""
+    dictionary = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if ":" not in line:
+            raise ValueError(f"Invalid line format in database.txt: {line}")
+        key, value = line.split(":", 1)
+        dictionary[key.strip()] = value.strip()
+    return dictionary
+
+def read_dictionary(path=DEFAULT_DATABASE_PATH):
+    """Reads a dictionary file. Raises FileNotFoundError if it does not exist."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The {os.path.basename(path)} file was not found.")
+    with open(path, "r") as file:
+        return parse_dictionary(file)
+
+@contextmanager
+def atomic_write(path, binary=False, permissions=0o644, keep_permissions=False, encoding=None):
+    """File to write path through: a temporary file next to it that replaces
+    it when the block ends, or is removed if the block raises.
+
+    keep_permissions keeps the mode of an existing file instead of permissions.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=encoding) as file:
+            yield file
+        if keep_permissions and os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, permissions)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def write_dictionary(dictionary, path=DEFAULT_DATABASE_PATH):
+    """Writes a dictionary back in the 'word: code' format.
+
+    Written through atomic_write(), so a reader never sees a half-written
+    dictionary.
+    """
+    with atomic_write(path, keep_permissions=True) as file:
+        for word, code in dictionary.items():
+            file.write(f"{word}: {code}\n")
+
+# =============================================
+# ENCRYPTION/DECRYPTION FUNCTIONS
+# =============================================
+def _shift_tables(direction):
+    """One str and one bytes translate table per key shift (0..35)."""
+    str_tables = []
+    byte_tables = []
+    for shift in range(CHAR_SET_LENGTH):
+        rotated = ''.join(ALLOWED_CHARS[(i + direction * shift) % CHAR_SET_LENGTH] for i in range(CHAR_SET_LENGTH))
+        str_tables.append(str.maketrans(ALLOWED_CHARS, rotated))
+        byte_tables.append(bytes.maketrans(ALLOWED_CHARS.encode("ascii"), rotated.encode("ascii")))
+    return str_tables, byte_tables
+
+ENCRYPT_TABLES = _shift_tables(1)
+DECRYPT_TABLES = _shift_tables(-1)
+
+def key_shifts(key):
+    """Shift for each key character, or 0 for characters outside ALLOWED_CHARS."""
+    shifts = []
+    for k in key:
+        k = k.upper()
+        shifts.append(ALLOWED_CHARS.index(k) if k in ALLOWED_CHARS else 0)
+    return shifts
+
+def _apply_key(text, key, tables, offset=0):
+    """Runs every key position over its whole stride of the text at once.
+
+    Position i of the key touches text[i::len(key)], so each stride is a
+    single translate() call instead of one index() lookup per character.
+    Characters outside ALLOWED_CHARS are absent from the tables and pass
+    through untouched, exactly like the per-character version. offset is
+    the key position of the first character, for text that continues an
+    earlier chunk.
+    """
+    period = len(key)
+    if period == 0:
+        raise ZeroDivisionError("The key must not be empty.")
+    offset %= period
+    key = key[offset:] + key[:offset]
+    str_tables, byte_tables = tables
+    shifts = key_shifts(key[:len(text)])
+    if text.isascii():
+        buffer = bytearray(text, "ascii")
+        for i, shift in enumerate(shifts):
+            if shift:
+                buffer[i::period] = buffer[i::period].translate(byte_tables[shift])
+        return buffer.decode("ascii")
+    chars = list(text)
+    for i, shift in enumerate(shifts):
+        if shift:
+            chars[i::period] = text[i::period].translate(str_tables[shift])
+    return ''.join(chars)
+
+def vigenere_like_encrypt(text, key, offset=0):
+    """Encrypts text using a Vigenère-like cipher, ensuring output is within the allowed character set."""
+    return _apply_key(text, key, ENCRYPT_TABLES, offset)
+
+def vigenere_like_decrypt(text, key, offset=0):
+    """Decrypts text using a Vigenère-like cipher, ensuring output is within the allowed character set."""
+    return _apply_key(text, key, DECRYPT_TABLES, offset)
+
+# =============================================
+# STREAMING HELPERS
+# =============================================
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+def iter_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Reads a text file object in fixed-size chunks."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def file_lines(paths):
+    """Lines of the given text files, one file after another."""
+    for path in paths:
+        with open(path, "r", errors="replace") as file:
+            yield from file
+
+def split_complete_words(data):
+    """Splits data into (complete words, trailing partial word)."""
+    if not data or data[-1].isspace():
+        return data, ''
+    parts = data.rsplit(None, 1)
+    if len(parts) == 1:
+        return '', data
+    return parts[0], parts[1]
+
+# =============================================
+# TOKENIZER
+# =============================================
+class Token:
+    """One whitespace-separated word with its position in the source text."""
+
+    __slots__ = ("text", "start", "end", "cleaned", "code", "span")
+
+    def __init__(self, text, start, end, cleaned, code):
+        self.text = text        # As typed
+        self.start = start      # Character offsets into the source text
+        self.end = end
+        self.cleaned = cleaned  # Lowercase, punctuation removed
+        self.code = code        # Dictionary code, or None
+        self.span = 1           # Words covered by code; 0 if part of an earlier phrase
+
+    @property
+    def missing(self):
+        """Worth warning about: not in the dictionary and 4+ letters long."""
+        return self.span > 0 and self.code is None and len(self.cleaned) >= 4
+
+    @property
+    def payload(self):
+        """What this word contributes to the payload before encryption."""
+        if not self.span:
+            return ''
+        return (self.code if self.code is not None else escape_verbatim(self.text.lower())).upper()
+
+def tokenize(text, reference, trie=None, offset=0, composer=None):
+    """Splits text like str.split() in one pass, looking every word up.
+
+    With a phrase trie, the first token of each matched phrase gets the
+    phrase code and the tokens it covers get span 0. With a Composer,
+    words that are not in the dictionary get a composed code if one is
+    shorter than the word.
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        word = match.group()
+        cleaned = word.lower().translate(PUNCTUATION_TABLE)
+        tokens.append(Token(word, match.start() + offset, match.end() + offset, cleaned, reference.get(cleaned)))
+    if trie:
+        cleaned_words = [token.cleaned for token in tokens]
+        i = 0
+        while i < len(tokens):
+            code, length = match_phrase(trie, cleaned_words, i)
+            if code is None:
+                i += 1
+                continue
+            tokens[i].code, tokens[i].span = code, length
+            for token in tokens[i + 1:i + length]:
+                token.span = 0
+            i += length
+    if composer is not None:
+        for token in tokens:
+            if token.span == 1 and token.code is None and token.cleaned and composable(token.text, token.cleaned):
+                token.code = composer.compose(token.cleaned)
+    return tokens
+
+def payload_length(tokens):
+    """Length of the payload the tokens encode to (the cipher keeps lengths)."""
+    pieces = [token.payload for token in tokens if token.span]
+    if not pieces:
+        return 0
+    return sum(len(piece) for piece in pieces) + len(pieces) - 1
+
+# =============================================
+# PHRASES
+# =============================================
+def build_phrase_trie(reference):
+    """Word trie over the multi-word entries ("how are you: XX@") of a dictionary.
+
+    Returns (trie, longest phrase in words). Nodes are dicts keyed by word;
+    the None key of a node holds the code of the phrase ending there.
+    """
+    trie = {}
+    max_words = 1
+    for key, code in reference.items():
+        words = key.split()
+        if len(words) < 2:
+            continue
+        node = trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node[None] = code
+        max_words = max(max_words, len(words))
+    return trie, max_words
+
+def match_phrase(trie, cleaned_words, start):
+    """(code, words) of the longest phrase starting at start, or (None, 0)."""
+    node = trie
+    best = (None, 0)
+    i = start
+    while i < len(cleaned_words):
+        node = node.get(cleaned_words[i])
+        if node is None:
+            break
+        i += 1
+        code = node.get(None)
+        if code is not None:
+            best = (code, i - start)
+    return best
+
+# =============================================
+# WORD COMPOSITION
+# =============================================
+# A word missing from the dictionary can still be sent as pieces that are
+# in it, joined into one token: "houses" -> "<code of house>+S". Pieces are
+# dictionary words, subword units (entries like "-ation: X1@") or literal
+# letters. Decoding concatenates the pieces again. A literal piece is never
+# one that reads as a code, and a verbatim word containing JOIN gets one
+# more JOIN at the end, so every token decodes one way only.
+JOIN = '+'
+UNIT_PREFIX = '-'
+COMPOSER_MEMO_LIMIT = 50000
+LITERAL_SLACK = 4  # A literal piece is at most this much longer than the longest dictionary piece
+
+def composable(word, cleaned):
+    """Whether composing cleaned gives word back, give or take punctuation ending a sentence.
+
+    "w1aw/portable" or "self-test" lose characters inside the word when
+    cleaned, so they are sent verbatim instead.
+    """
+    return word.lower().rstrip(SENTENCE_END) == cleaned
+
+def escape_verbatim(word):
+    """A word sent as typed, protected from being read as a composition."""
+    return word + JOIN if JOIN in word else word
+
+def restore_token(token, reverse):
+    """Lowercase word for one decrypted payload token."""
+    word = reverse.get(token)
+    if word is not None:
+        return word.lower()
+    if JOIN in token:
+        if token.endswith(JOIN):
+            return token[:-1].lower()  # Escaped verbatim word
+        parts = token.split(JOIN)
+        if all(parts):
+            pieces = []
+            for part in parts:
+                piece = reverse.get(part)
+                if piece is None:
+                    piece = part
+                elif piece.startswith(UNIT_PREFIX):
+                    piece = piece[len(UNIT_PREFIX):]
+                pieces.append(piece.lower())
+            return ''.join(pieces)
+    return token.lower()
+
+def composition_pieces(reference, reverse):
+    """(pieces, codes) a Composer works from, in one pass over the dictionary.
+
+    pieces maps each word or subword unit to the shortest code that
+    decodes back to it; codes holds every code, so no literal piece reads
+    as one.
+    """
+    pieces = {}
+    codes = set()
+    for code, key in reverse.items():
+        codes.add(code)
+        if ' ' in key or reference.get(key) != code:
+            continue  # Phrases, and duplicate codes that decode to another word
+        piece = key[len(UNIT_PREFIX):] if key.startswith(UNIT_PREFIX) else key
+        if piece and (piece not in pieces or len(code) < len(pieces[piece])):
+            pieces[piece] = code
+    return pieces, codes
+
+class Composer:
+    """Finds the shortest composition of missing words for one dictionary version."""
+
+    def __init__(self, reference, reverse, pieces=None, codes=None, max_piece=None):
+        self.reference = reference
+        if pieces is None or codes is None:
+            pieces, codes = composition_pieces(reference, reverse)
+        self.pieces = pieces  # Composing is lookups only
+        self.codes = codes
+        self.max_piece = max(map(len, pieces), default=0) if max_piece is None else max_piece
+        self._memo = {}
+
+    def compose(self, word):
+        """Composed token for word, or None if spelling it out is as short."""
+        try:
+            return self._memo[word]
+        except KeyError:
+            pass
+        if len(self._memo) >= COMPOSER_MEMO_LIMIT:
+            self._memo.clear()
+        result = self._memo[word] = self._compose(word) if word and JOIN not in word else None
+        return result
+
+    def _compose(self, word):
+        n = len(word)
+        pieces = self.pieces
+        codes = self.codes
+        infinity = float("inf")
+        # Cheapest encoding of word[i:] that starts with a code / with literal letters,
+        # and where that first piece ends
+        code_cost = [infinity] * (n + 1)
+        code_end = [0] * (n + 1)
+        literal_cost = [infinity] * (n + 1)
+        literal_end = [0] * (n + 1)
+        code_cost[n] = 0
+        code_starts = [n]  # Positions a code piece (or the end) can follow a literal at, descending
+        max_literal = self.max_piece + LITERAL_SLACK  # Keeps long tokens linear instead of cubic
+        for i in range(n - 1, -1, -1):
+            for j in range(i + 1, min(n, i + self.max_piece) + 1):
+                code = pieces.get(word[i:j])
+                if code is None or (i == 0 and j == n):
+                    continue
+                cost = len(code) + (min(code_cost[j], literal_cost[j]) + 1 if j < n else 0)
+                if cost < code_cost[i]:
+                    code_cost[i], code_end[i] = cost, j
+            # Literal letters must be followed by a code, and must not read as one
+            for j in reversed(code_starts):
+                if j - i > max_literal:
+                    break
+                if (i > 0 or j < n) and word[i:j].upper() not in codes:
+                    cost = j - i + (code_cost[j] + 1 if j < n else 0)
+                    if cost < literal_cost[i]:
+                        literal_cost[i], literal_end[i] = cost, j
+            if code_cost[i] < infinity:
+                code_starts.append(i)
+        if min(code_cost[0], literal_cost[0]) >= n:
+            return None
+        parts = []
+        i = 0
+        literal = literal_cost[0] < code_cost[0]
+        while i < n:
+            if literal:
+                j = literal_end[i]
+                parts.append(word[i:j])
+                literal = False  # A literal is always followed by a code
+            else:
+                j = code_end[i]
+                parts.append(pieces[word[i:j]])
+                literal = j < n and literal_cost[j] < code_cost[j]
+            i = j
+        return JOIN.join(parts)
+
+# =============================================
+# CODEC
+# =============================================
+class Codec:
+    """Word substitution plus cipher, backed by a lazily loaded dictionary."""
+
+    def __init__(self, database_path=DEFAULT_DATABASE_PATH, compiled=True, seed=None):
+        self.database_path = database_path
+        self.compiled = compiled  # Use the mmap-backed sidecar cache (see dictcache.py)
+        self.seed = seed  # Permute the file's codes with this passphrase (see keyed.py)
+        self._tables = None  # (reference, reverse), always replaced as one object
+        self._phrases = (None, {}, 1)  # (reference it was built from, trie, longest phrase)
+        self._composer = None  # Composer of the current reference
+
+    def read_tables(self):
+        """Builds fresh (reference, reverse) tables from the file without publishing them."""
+        if self.compiled:
+            from dictcache import open_compiled
+            reference, reverse = open_compiled(self.database_path)
+        else:
+            reference = read_dictionary(self.database_path)
+            reverse = {v: k for k, v in reference.items()}
+        return self.key_tables(reference, reverse)
+
+    def key_tables(self, reference, reverse):
+        """Tables of the file as used on the air: permuted by the seed, if there is one."""
+        if self.seed:
+            from keyed import KeyedDictionary
+            keyed = KeyedDictionary(reference, self.seed)
+            return keyed.reference, keyed.reverse
+        return reference, reverse
+
+    def load(self):
+        """(Re)reads the dictionary file. Errors are left to the caller."""
+        self.publish(*self.read_tables())
+
+    def set_dictionary(self, dictionary):
+        """Replaces the dictionary with an in-memory word -> code mapping."""
+        self.publish(dictionary, {v: k for k, v in dictionary.items()})
+
+    def publish(self, reference, reverse):
+        """Swaps in new tables with a single reference assignment.
+
+        An encode or decode that already started keeps the tables it
+        fetched, so a reload never mixes two dictionary versions.
+        """
+        self._tables = (reference, reverse)
+
+    @property
+    def loaded(self):
+        return self._tables is not None
+
+    @property
+    def tables(self):
+        """(reference, reverse), loaded on first access."""
+        tables = self._tables
+        if tables is None:
+            self.load()
+            tables = self._tables
+        return tables
+
+    @property
+    def reference(self):
+        """word -> code, loaded on first access."""
+        return self.tables[0]
+
+    @property
+    def reverse(self):
+        """code -> word, loaded on first access."""
+        return self.tables[1]
+
+    def phrase_trie(self, reference=None):
+        """(trie, longest phrase) for the phrase entries, rebuilt after a reload."""
+        if reference is None:
+            reference = self.reference
+        phrases = self._phrases
+        if phrases[0] is not reference:
+            # A compiled table carries its phrase entries, so the table itself is not walked
+            index = getattr(reference, "index", None)
+            phrases = (reference,) + build_phrase_trie(index.phrases if index is not None else reference)
+            self._phrases = phrases
+        return phrases[1], phrases[2]
+
+    def composer(self, reference=None):
+        """Composer for missing words, rebuilt after a reload."""
+        if reference is None:
+            reference = self.reference
+        composer = self._composer
+        if composer is None or composer.reference is not reference:
+            index = getattr(reference, "index", None)
+            if index is not None:
+                composer = Composer(reference, None, index.pieces, index.codes, index.longest)
+            else:
+                tables = self.tables
+                reverse = tables[1] if tables[0] is reference else {v: k for k, v in reference.items()}
+                composer = Composer(reference, reverse)
+            self._composer = composer
+        return composer
+
+    def substitute(self, text, reference=None, phrases=True, compose=True):
+        """Replaces dictionary words and phrases with their codes.
+
+        Returns the uppercase payload (before encryption) and the list of
+        words of 4+ letters that were sent verbatim.
+        """
+        if reference is None:
+            reference = self.reference
+        processed_words, missing_words, _ = self._substitute_words(text.lower().split(), reference,
+                                                                   phrases=phrases, compose=compose)
+        return ' '.join(processed_words).upper(), missing_words
+
+    def _substitute_words(self, words, reference, limit=None, phrases=True, compose=True):
+        """Greedy longest-match substitution over lowercase words.
+
+        Only positions before limit start a new entry, although a phrase
+        starting there may use later words. Words that are not in the
+        dictionary are composed from pieces when that is shorter. Returns
+        the processed words, the missing words and how many words were
+        consumed.
+        """
+        trie = self.phrase_trie(reference)[0] if phrases else None
+        composer = self.composer(reference) if compose else None
+        cleaned_words = [word.translate(PUNCTUATION_TABLE) for word in words]
+        if limit is None:
+            limit = len(words)
+        processed_words = []
+        missing_words = []
+        i = 0
+        while i < limit:
+            if trie:
+                code, length = match_phrase(trie, cleaned_words, i)
+                if code is not None:
+                    processed_words.append(code)
+                    i += length
+                    continue
+            word = words[i]
+            cleaned_word = cleaned_words[i]
+            code = reference.get(cleaned_word)
+            if code is None and composer is not None and cleaned_word and composable(word, cleaned_word):
+                code = composer.compose(cleaned_word)
+            if code is not None:
+                processed_words.append(code)
+            else:
+                processed_words.append(escape_verbatim(word))
+                if len(cleaned_word) >= 4:
+                    missing_words.append(word)
+            i += 1
+        return processed_words, missing_words, i
+
+    def tokenize(self, text, reference=None):
+        """Tokens with offsets and dictionary hits, see tokenize()."""
+        if reference is None:
+            reference = self.reference
+        return tokenize(text, reference, self.phrase_trie(reference)[0], composer=self.composer(reference))
+
+    def substitute_tokens(self, tokens):
+        """Same result as substitute(), from already tokenized text."""
+        payload = ' '.join(token.payload for token in tokens if token.span)
+        return payload, [token.text.lower() for token in tokens if token.missing]
+
+    def restore(self, text, reverse=None):
+        """Replaces codes in an already decrypted payload with their words."""
+        if reverse is None:
+            reverse = self.reverse
+        return ' '.join(restore_token(word, reverse) for word in text.split())
+
+    def encode(self, text, password):
+        """Substitutes and encrypts a plaintext message."""
+        processed_text, _ = self.substitute(text)
+        return vigenere_like_encrypt(processed_text, password.upper())
+
+    def decode(self, text, password):
+        """Decrypts a received payload and substitutes the codes back."""
+        return self.restore(vigenere_like_decrypt(text.strip().upper(), password.upper()))
+
+    def encode_many(self, texts, password):
+        """Encodes a batch of messages with the same password."""
+        key = password.upper()
+        reference = self.reference
+        return [vigenere_like_encrypt(self.substitute(text, reference)[0], key) for text in texts]
+
+    def decode_many(self, texts, password):
+        """Decodes a batch of payloads with the same password."""
+        key = password.upper()
+        reverse = self.reverse
+        return [self.restore(vigenere_like_decrypt(text.strip().upper(), key), reverse) for text in texts]
+
+    def encode_stream(self, chunks, password):
+        """Generator version of encode() for input of any size.
+
+        Words are never split across chunks and the key position carries
+        over, so the joined output equals encode() on the whole input.
+        The whole stream uses the dictionary version it started with.
+        The last words of a chunk wait for the next one when a phrase
+        could still continue there.
+        """
+        key = password.upper()
+        reference = self.reference
+        lookahead = self.phrase_trie(reference)[1] - 1
+        position = 0
+        carry = ''
+        pending = []
+        for chunk in chunks:
+            complete, carry = split_complete_words(carry + chunk)
+            pending.extend(complete.lower().split())
+            limit = len(pending) - lookahead
+            if limit > 0:
+                processed_words, _, consumed = self._substitute_words(pending, reference, limit)
+                del pending[:consumed]
+                payload = self._stream_payload(processed_words, position)
+                if payload:
+                    yield vigenere_like_encrypt(payload, key, position)
+                    position += len(payload)
+        pending.extend(carry.lower().split())
+        processed_words, _, _ = self._substitute_words(pending, reference)
+        payload = self._stream_payload(processed_words, position)
+        if payload:
+            yield vigenere_like_encrypt(payload, key, position)
+
+    def _stream_payload(self, processed_words, position):
+        """Payload of one piece, space-joined to what came before."""
+        payload = ' '.join(processed_words).upper()
+        if payload and position:
+            payload = ' ' + payload
+        return payload
+
+    def decode_stream(self, chunks, password):
+        """Generator version of decode() for input of any size."""
+        key = password.upper()
+        reverse = self.reverse
+        position = 0
+        carry = ''
+        emitted = False
+        for chunk in chunks:
+            chunk = chunk.upper()
+            if not position:
+                chunk = chunk.lstrip()  # decode() strips leading whitespace too
+                if not chunk:
+                    continue
+            decrypted = vigenere_like_decrypt(chunk, key, position)
+            position += len(chunk)
+            complete, carry = split_complete_words(carry + decrypted)
+            restored = self.restore(complete, reverse)
+            if restored:
+                yield (' ' if emitted else '') + restored
+                emitted = True
+        restored = self.restore(carry, reverse)
+        if restored:
+            yield (' ' if emitted else '') + restored
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""Bounded LRU cache of loaded dictionaries.
+
+Switching nets, or decoding traffic from stations on different
+dictionaries, should not parse a file every time. CodecCache keeps the
+most recently used Codecs loaded, up to a number of entries and an
+estimated memory budget, and drops the least recently used ones first.
+A cached Codec is reloaded when its file changed on disk (mtime or size)
+since it was loaded.
+
+Memory is estimated when a dictionary is loaded, by walking its tables:
+Python strings and dicts for text dictionaries, the mapped file for
+compiled ones (see dictcache.py). Lookup memos that grow afterwards are
+not counted.
+"""
+import mmap
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+
+from codec import Codec
+from nearest import TolerantDecoder
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 8
+
+def estimate_bytes(obj, seen=None):
+    """Approximate memory held by obj and everything it references."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, mmap.mmap):
+            total += len(item)
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, types.MethodType):
+            stack.append(item.__self__)
+        elif hasattr(item, "__dict__"):
+            stack.append(vars(item))
+        elif hasattr(item, "__slots__"):
+            stack.extend(getattr(item, name) for name in item.__slots__ if hasattr(item, name))
+    return total
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class _Entry:
+    def __init__(self, codec, signature, nbytes):
+        self.codec = codec
+        self.signature = signature  # (mtime_ns, size) of the file when it was loaded
+        self.nbytes = nbytes
+        self.decoder = None  # TolerantDecoder of this codec, made on first use
+
+class CodecCache:
+    """Loaded Codecs keyed by (dictionary path, seed), least recently used evicted first."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES, compiled=True):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.compiled = compiled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, database_path, seed=None):
+        """A loaded Codec for the dictionary; raises like Codec.load() if it cannot be read."""
+        key = (os.path.abspath(database_path), seed or None)
+        signature = _signature(key[0])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.codec
+            self.misses += 1
+        # Load outside the lock so other dictionaries stay available meanwhile
+        codec = Codec(key[0], compiled=self.compiled, seed=key[1])
+        codec.load()
+        entry = _Entry(codec, signature, estimate_bytes(codec.tables))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+            self._entries[key] = entry
+            self.total_bytes += entry.nbytes
+            self._evict()
+        return codec
+
+    def decoder(self, database_path, seed=None):
+        """TolerantDecoder of the dictionary's cached Codec, made once per loaded Codec."""
+        codec = self.get(database_path, seed)
+        with self._lock:
+            entry = self._entries.get((os.path.abspath(database_path), seed or None))
+            if entry is None or entry.codec is not codec:
+                return TolerantDecoder(codec)  # Evicted or reloaded meanwhile
+            if entry.decoder is None:
+                entry.decoder = TolerantDecoder(codec)
+            return entry.decoder
+
+    def _evict(self):
+        # The entry just added always stays, even if it alone is over budget
+        while len(self._entries) > 1 and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry.nbytes
+            self.evictions += 1
+
+    def discard(self, database_path, seed=None):
+        with self._lock:
+            entry = self._entries.pop((os.path.abspath(database_path), seed or None), None)
+            if entry is not None:
+                self.total_bytes -= entry.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def summary(self):
+        return (f"{len(self._entries)} dictionaries, {self.total_bytes / 1e6:.1f} MB "
+                f"(limit {self.max_bytes / 1e6:.0f} MB), {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evicted")
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""Compiled sidecar cache for database.txt.
+
+The text dictionary stays the source of truth. Next to it a binary file
+(database.txt.jrc) holds the word -> code and code -> word tables sorted
+by key, so opening it is one mmap and a lookup is a binary search in the
+mapped bytes, without building a Python object per entry.
+
+Layout (little-endian):
+    header   magic, version, source mtime_ns, source size, source sha256,
+             forward count, reverse count
+    forward  one record per word, sorted by word
+    reverse  one record per code, sorted by code
+    blob     UTF-8 strings the records point into
+    index    JSON: subword unit and phrase entries and the longest piece
+             and code, so the codec never has to walk the tables (see
+             CompiledIndex)
+
+The cache is trusted when the source mtime and size match the header,
+or failing that when the source hash does; otherwise it is rebuilt.
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+from itertools import chain
+
+MAGIC = b"JRDC"
+VERSION = 3
+HEADER = struct.Struct("<4sIqq32sIII")  # ..., forward count, reverse count, index length
+RECORD = struct.Struct("<IHIH")  # key offset, key length, value offset, value length
+CACHE_SUFFIX = ".jrc"
+MEMO_LIMIT = 50000  # Looked-up keys remembered per table before the memo starts over
+
+def cache_path_for(path):
+    return path + CACHE_SUFFIX
+
+# =============================================
+# LOOKUP
+# =============================================
+class CompiledTable:
+    """Read-only mapping over one sorted table of a compiled cache."""
+
+    def __init__(self, buffer, table_offset, count, blob_offset):
+        self._buffer = buffer
+        self._table_offset = table_offset
+        self._count = count
+        self._blob_offset = blob_offset
+        self.index = None  # CompiledIndex of the forward table
+        self._memo = {}  # Keys found so far, so repeated words cost one dict hit
+
+    def _record(self, index):
+        return RECORD.unpack_from(self._buffer, self._table_offset + index * RECORD.size)
+
+    def _string(self, offset, length):
+        start = self._blob_offset + offset
+        return bytes(self._buffer[start:start + length])
+
+    def _find(self, key):
+        try:
+            target = key.encode("utf-8")
+        except UnicodeEncodeError:
+            return None
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, value_offset, value_length = self._record(middle)
+            candidate = self._string(key_offset, key_length)
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle
+            else:
+                return self._string(value_offset, value_length).decode("utf-8")
+        return None
+
+    def _bisect(self, target, low, high):
+        buffer, blob = self._buffer, self._blob_offset
+        table, size, unpack = self._table_offset, RECORD.size, RECORD.unpack_from
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length = unpack(buffer, table + middle * size)[:2]
+            start = blob + key_offset
+            if buffer[start:start + key_length] < target:  # Slices of the mmap or bytes are bytes
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def prefix_range(self, prefix, low=0, high=None):
+        """Record range of the keys starting with prefix, searched for within low..high."""
+        target = prefix.encode("utf-8", "surrogatepass")
+        start = self._bisect(target, low, self._count if high is None else high)
+        return start, self._bisect(target + b"\xff", start, self._count if high is None else high)  # No UTF-8 byte sorts after 0xff
+
+    def entry(self, index):
+        """(key, value) of one record."""
+        key_offset, key_length, value_offset, value_length = self._record(index)
+        return (self._string(key_offset, key_length).decode("utf-8"),
+                self._string(value_offset, value_length).decode("utf-8"))
+
+    def get(self, key, default=None):
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = self._find(key)
+        if value is None:
+            return default  # Misses are not remembered, so a stream of new words stays flat
+        if len(self._memo) >= MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = value
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        """(key, value) pairs in key order, decoded one at a time."""
+        buffer = self._buffer
+        blob = self._blob_offset
+        table = buffer[self._table_offset:self._table_offset + self._count * RECORD.size]
+        for key_offset, key_length, value_offset, value_length in RECORD.iter_unpack(table):
+            key_start = blob + key_offset
+            value_start = blob + value_offset
+            yield (buffer[key_start:key_start + key_length].decode("utf-8"),
+                   buffer[value_start:value_start + value_length].decode("utf-8"))
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+class CompiledPieces:
+    """Composition pieces served from the tables themselves.
+
+    Same answers as the pieces of codec.composition_pieces(): a word is
+    looked up in the forward table, a subword unit in the index. The
+    composer asks for longer and longer pieces from one position, so the
+    range of words starting with each prefix is remembered and the next
+    search only looks inside it.
+    """
+
+    def __init__(self, forward, reverse, units):
+        self._forward = forward
+        self._reverse = reverse
+        self._units = units  # unit without its prefix -> code
+        self._ranges = {}  # prefix -> record range of the words starting with it
+
+    def _range(self, piece):
+        found = self._ranges.get(piece)
+        if found is None:
+            # The composer asked for piece[:-1] just before, so this recursion is shallow
+            low, high = self._range(piece[:-1]) if len(piece) > 1 else (0, len(self._forward))
+            found = self._forward.prefix_range(piece, low, high) if low < high else (low, low)
+            if len(self._ranges) >= MEMO_LIMIT:
+                self._ranges.clear()
+            self._ranges[piece] = found
+        return found
+
+    def get(self, piece, default=None):
+        code = None
+        low, high = self._range(piece)
+        if low < high:
+            key, value = self._forward.entry(low)  # The shortest word with this prefix comes first
+            if key == piece and self._reverse.get(value) == piece:
+                code = value  # Not a duplicate code that decodes to another word
+        unit = self._units.get(piece)
+        if unit is not None and (code is None or len(unit) < len(code)):
+            code = unit
+        return default if code is None else code
+
+    def __getitem__(self, piece):
+        code = self.get(piece)
+        if code is None:
+            raise KeyError(piece)
+        return code
+
+class CompiledCodes:
+    """Code membership served from the reverse table, for the composer's literal check."""
+
+    def __init__(self, reverse, longest):
+        self._reverse = reverse
+        self._longest = longest  # Longer strings are never codes
+        self._memo = {}  # Short strings checked so far, misses included
+
+    def __contains__(self, code):
+        if len(code) > self._longest:
+            return False
+        try:
+            return self._memo[code]
+        except KeyError:
+            pass
+        if len(self._memo) >= MEMO_LIMIT:
+            self._memo.clear()
+        found = self._memo[code] = code in self._reverse
+        return found
+
+class CompiledIndex:
+    """What the composer and the phrase matcher need, decoded on first use.
+
+    Only the unit and phrase entries are stored; words and codes are
+    looked up in the tables.
+    """
+
+    def __init__(self, buffer, offset, length, forward, reverse):
+        self._buffer = buffer
+        self._offset = offset
+        self._length = length
+        self._forward = forward
+        self._reverse = reverse
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            units, phrases, longest, longest_code = json.loads(bytes(self._buffer[self._offset:self._offset + self._length]))
+            self._data = (CompiledPieces(self._forward, self._reverse, units), phrases, longest,
+                          CompiledCodes(self._reverse, longest_code))
+        return self._data
+
+    @property
+    def pieces(self):
+        """word or subword unit -> code, see codec.composition_pieces()."""
+        return self._load()[0]
+
+    @property
+    def phrases(self):
+        """Multi-word entries, phrase -> code."""
+        return self._load()[1]
+
+    @property
+    def longest(self):
+        """Length of the longest piece."""
+        return self._load()[2]
+
+    @property
+    def codes(self):
+        """Membership test for codes, answered from the reverse table."""
+        return self._load()[3]
+
+def open_tables(buffer):
+    """(forward, reverse) tables over a compiled cache buffer."""
+    _, _, _, _, _, forward_count, reverse_count, index_length = HEADER.unpack_from(buffer, 0)
+    forward_offset = HEADER.size
+    reverse_offset = forward_offset + forward_count * RECORD.size
+    blob_offset = reverse_offset + reverse_count * RECORD.size
+    forward = CompiledTable(buffer, forward_offset, forward_count, blob_offset)
+    reverse = CompiledTable(buffer, reverse_offset, reverse_count, blob_offset)
+    forward.index = CompiledIndex(buffer, len(buffer) - index_length, index_length, forward, reverse)
+    return forward, reverse
+
+# =============================================
+# BUILDING
+# =============================================
+def compile_dictionary(dictionary, mtime_ns, size, digest):
+    """Serializes a word -> code dictionary into the cache format."""
+    from codec import UNIT_PREFIX, composition_pieces
+
+    reverse = {v: k for k, v in dictionary.items()}  # Same "last word wins" rule as the codec
+    strings = {}  # text -> (blob offset, length, UTF-8 bytes); every word and code stored once
+    parts = []
+    position = 0
+    for text in chain.from_iterable(dictionary.items()):
+        if text not in strings:
+            encoded = text.encode("utf-8")
+            strings[text] = (position, len(encoded), encoded)
+            parts.append(encoded)
+            position += len(encoded)
+    blob = b"".join(parts)
+
+    def records(mapping):
+        fields = []
+        for key, value in sorted(mapping.items(), key=lambda item: strings[item[0]][2]):
+            key_offset, key_length, _ = strings[key]
+            value_offset, value_length, _ = strings[value]
+            fields += (key_offset, key_length, value_offset, value_length)
+        return struct.pack("<" + RECORD.format.lstrip("<") * len(mapping), *fields)
+
+    forward_table = records(dictionary)
+    reverse_table = records(reverse)
+    pieces, _ = composition_pieces(dictionary, reverse)
+    units = {key[len(UNIT_PREFIX):]: code for key, code in dictionary.items()
+             if key.startswith(UNIT_PREFIX) and pieces.get(key[len(UNIT_PREFIX):]) == code}
+    phrases = {key: code for key, code in dictionary.items() if len(key.split()) > 1}
+    longest = max(map(len, pieces), default=0)
+    longest_code = max(map(len, reverse), default=0)
+    index = json.dumps([units, phrases, longest, longest_code], ensure_ascii=False).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, mtime_ns, size, digest, len(dictionary), len(reverse), len(index))
+    return header + forward_table + reverse_table + blob + index
+
+def _map_cache(cache_path):
+    """Maps an existing cache file, or returns None if it is missing or foreign."""
+    try:
+        with open(cache_path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < HEADER.size:
+        buffer.close()
+        return None
+    magic, version = HEADER.unpack_from(buffer, 0)[:2]
+    if magic != MAGIC or version != VERSION:
+        buffer.close()
+        return None
+    return buffer
+
+def _write_cache(cache_path, data):
+    from codec import atomic_write
+
+    with atomic_write(cache_path, binary=True) as file:
+        file.write(data)
+
+def rebuild_cache(path, cache_path=None):
+    """Compiles the text dictionary and returns the new cache buffer.
+
+    If the sidecar cannot be written (read-only folder, or the old cache is
+    still mapped on Windows) the compiled bytes are used from memory.
+    """
+    from codec import parse_dictionary
+
+    cache_path = cache_path or cache_path_for(path)
+    stat = os.stat(path)
+    with open(path, "rb") as file:
+        raw = file.read()
+    # Decode exactly like open(path, "r") so the cache matches read_dictionary()
+    dictionary = parse_dictionary(io.TextIOWrapper(io.BytesIO(raw)))
+    data = compile_dictionary(dictionary, stat.st_mtime_ns, stat.st_size, hashlib.sha256(raw).digest())
+    try:
+        _write_cache(cache_path, data)
+    except OSError:
+        return data
+    return _map_cache(cache_path) or data
+
+def load_buffer(path, cache_path=None):
+    """Returns an up-to-date cache buffer for the dictionary at path."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The {os.path.basename(path)} file was not found.")
+    cache_path = cache_path or cache_path_for(path)
+    buffer = _map_cache(cache_path)
+    if buffer is not None:
+        _, _, mtime_ns, size, digest = HEADER.unpack_from(buffer, 0)[:5]
+        stat = os.stat(path)
+        if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+            return buffer
+        with open(path, "rb") as file:
+            if hashlib.sha256(file.read()).digest() == digest:
+                return buffer
+        buffer.close()
+    return rebuild_cache(path, cache_path)
+
+def source_digest(buffer):
+    """sha256 of the text dictionary a cache buffer was compiled from."""
+    return HEADER.unpack_from(buffer, 0)[4]
+
+def open_compiled(path, cache_path=None):
+    """(forward, reverse) lookup tables for a dictionary file."""
+    return open_tables(load_buffer(path, cache_path))
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Sorted word and code indexes for the Manager's dictionary view.
+
+The Manager shows one window of rows at a time, so all it needs is the
+rows in order and the range of rows matching a search. Both orders are
+kept as sorted lists, so a prefix search is two bisects and adding a
+word is one insort per list instead of rebuilding anything.
+"""
+from bisect import bisect_left, insort
+
+BY_WORD = "word"
+BY_CODE = "code"
+
+# Sorts after every character a word or code can contain
+PREFIX_END = "\U0010ffff"
+
+class DictionaryIndex:
+    def __init__(self, dictionary=None):
+        self.rebuild(dictionary or {})
+
+    def rebuild(self, dictionary):
+        self.codes = dict(dictionary)  # word -> code
+        self.words = sorted(self.codes)
+        self.by_code = sorted((code, word) for word, code in self.codes.items())
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word, code):
+        """Adds or re-codes one entry; returns its row in word order."""
+        if word in self.codes:
+            self.remove(word)
+        self.codes[word] = code
+        insort(self.by_code, (code, word))
+        row = bisect_left(self.words, word)
+        self.words.insert(row, word)
+        return row
+
+    def add_many(self, pairs):
+        pairs = list(pairs)
+        if len(pairs) > len(self.words) // 8:
+            # Cheaper to sort once than to insert one by one
+            updated = dict(self.codes)
+            updated.update(pairs)
+            self.rebuild(updated)
+        else:
+            for word, code in pairs:
+                self.add(word, code)
+
+    def remove(self, word):
+        code = self.codes.pop(word)
+        del self.words[bisect_left(self.words, word)]
+        del self.by_code[bisect_left(self.by_code, (code, word))]
+
+    def search(self, query, by=BY_WORD):
+        """(first, end) rows whose word (or code) starts with query, in that order."""
+        if by == BY_CODE:
+            query = query.strip().upper()
+            return (bisect_left(self.by_code, (query,)),
+                    bisect_left(self.by_code, (query + PREFIX_END,)))
+        query = query.strip().lower()
+        return bisect_left(self.words, query), bisect_left(self.words, query + PREFIX_END)
+
+    def row(self, index, by=BY_WORD):
+        """(word, code) at a row of the given order."""
+        if by == BY_CODE:
+            code, word = self.by_code[index]
+            return word, code
+        word = self.words[index]
+        return word, self.codes[word]
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Bulk word ingest for the Dictionary Manager.
+
+Candidate words are deduplicated first, all codes are allocated in one
+pass and the dictionary file is written once at the end, instead of one
+full rewrite per word.
+"""
+import re
+
+from codec import file_lines, write_dictionary
+from allocator import CapacityError, calculate_max_codes
+
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]{4,}\b')  # Words with 4 or more letters
+
+def candidate_words(texts):
+    """Lowercased words of 4+ letters in first-seen order, without duplicates."""
+    seen = {}
+    for text in texts:
+        for word in WORD_PATTERN.findall(text):
+            seen.setdefault(word.lower(), None)
+    return list(seen)
+
+def validate_word(word, dictionary):
+    """Returns why a word cannot be added, or None if it can."""
+    if not word.isalpha() or len(word) < 4:
+        return f"Word '{word}' is invalid. Must be alphabetic and at least 4 characters long."
+    if word in dictionary:
+        return f"Word '{word}' already exists in the dictionary."
+    return None
+
+def allocate_words(dictionary, words, allocator, progress=None, progress_every=500, validate=validate_word):
+    """Assigns a code to every new word without touching the dictionary.
+
+    Returns (added, skipped): added is a list of (word, code) and skipped a
+    list of (word, reason). progress(done, total) is called every
+    progress_every words and once at the end. validate(word, dictionary)
+    returns a rejection reason or None.
+    """
+    added = []
+    skipped = []
+    batch = set()
+    free = calculate_max_codes() - len(dictionary)
+    total = len(words)
+    for done, word in enumerate(words, 1):
+        reason = validate(word, dictionary)
+        if reason is None and word in batch:
+            reason = f"Word '{word}' already exists in the dictionary."
+        if reason is None and len(added) >= free:
+            reason = "Dictionary is at maximum capacity. Cannot add new words."
+        if reason is None:
+            try:
+                added.append((word, allocator.allocate()))
+                batch.add(word)
+            except CapacityError as e:
+                reason = str(e)
+        if reason is not None:
+            skipped.append((word, reason))
+        if progress is not None and (done % progress_every == 0 or done == total):
+            progress(done, total)
+    return added, skipped
+
+def ingest_words(dictionary, words, allocator, path, progress=None, validate=validate_word):
+    """Allocates codes for all new words and writes the dictionary file once.
+
+    The caller's dictionary is left alone so it can be updated on the GUI
+    thread; merge the returned added pairs into it. If the write fails the
+    allocated codes are given back to the allocator.
+    """
+    added, skipped = allocate_words(dictionary, words, allocator, progress, validate=validate)
+    if added:
+        updated = dict(dictionary)
+        updated.update(added)
+        try:
+            write_dictionary(updated, path)
+        except Exception:
+            for _, code in added:
+                allocator.release(code)
+            raise
+    return added, skipped
+
+def ingest_files(dictionary, paths, allocator, path, progress=None):
+    """Headless variant: ingests every word of the given text files."""
+    return ingest_words(dictionary, candidate_words(file_lines(paths)), allocator, path, progress)
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""JS8Call API bridge.
+
+JS8Call exposes a local JSON API (one JSON object per line over TCP,
+one per datagram over UDP; see its API settings). JS8Bridge connects to
+it, decodes directed messages as they are received and encodes queued
+outgoing messages before handing them to JS8Call, so nothing has to go
+through the clipboard.
+
+The bridge runs its own asyncio loop on a background thread. Codec work
+happens in the loop's default executor, and results go to a notify
+callback, as with the reloader, which the GUI points at a queue it
+drains on its own thread. send() may be called from any thread.
+
+ReplayServer is a stand-in for JS8Call that replays a recording of API
+traffic (JSON lines, as written by JS8Bridge(record=...)) and keeps
+what the client sends, for trying the bridge without a radio.
+"""
+import asyncio
+import json
+import threading
+import time
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_TCP_PORT = 2442
+DEFAULT_UDP_PORT = 2242
+END_OF_MESSAGE = "♢"  # JS8Call appends this to complete messages
+RECONNECT_DELAY = 5.0
+
+def split_directed(text):
+    """(from, to, body) of a JS8Call directed message like 'N0CALL: KN4CRD  HELLO ♢'."""
+    text = text.replace(END_OF_MESSAGE, "").strip()
+    sender, _, rest = text.partition(":")
+    to, _, body = rest.strip().partition(" ")
+    return sender.strip(), to.strip(), body.strip()
+
+class Received:
+    """A directed message and its decoded text."""
+
+    def __init__(self, sender, to, utc, payload, text):
+        self.sender = sender    # Callsign it came from
+        self.to = to            # Callsign or @GROUP it was sent to
+        self.utc = utc          # JS8Call timestamp (ms since the epoch), or None
+        self.payload = payload  # Text as received
+        self.text = text        # Decoded text, or None if it could not be decoded
+
+# =============================================
+# TRANSPORTS
+# =============================================
+class _TcpLink:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def receive(self):
+        """Next raw message, or None when the connection is closed."""
+        line = await self.reader.readline()
+        return line.decode("utf-8", errors="replace") if line else None
+
+    async def send(self, line):
+        self.writer.write(line.encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    def close(self):
+        self.writer.close()
+
+class _UdpLink(asyncio.DatagramProtocol):
+    """JS8Call sends datagrams to a port we listen on and takes commands back from there."""
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.transport = None
+        self.peer = None
+
+    @classmethod
+    async def open(cls, host, port):
+        loop = asyncio.get_running_loop()
+        _, link = await loop.create_datagram_endpoint(cls, local_addr=(host, port))
+        return link
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.peer = addr
+        self.messages.put_nowait(data.decode("utf-8", errors="replace"))
+
+    def connection_lost(self, exc):
+        self.messages.put_nowait(None)
+
+    async def receive(self):
+        return await self.messages.get()
+
+    async def send(self, line):
+        if self.peer is None:
+            raise ConnectionError("Nothing received from JS8Call yet; no address to reply to.")
+        self.transport.sendto(line.encode("utf-8"), self.peer)
+
+    def close(self):
+        self.transport.close()
+
+# =============================================
+# BRIDGE
+# =============================================
+class JS8Bridge:
+    """Decodes received and encodes outgoing JS8Call messages with a Codec."""
+
+    def __init__(self, codec, password_for, host=DEFAULT_HOST, port=None, udp=False,
+                 notify=None, record=None, reconnect=True, decode=None, codec_for=None):
+        self.codec = codec
+        self.codec_for = codec_for or (lambda callsign: self.codec)  # callsign -> Codec of that station's net
+        self.decode = decode or (lambda payload, password, codec: codec.decode(payload, password))
+        self.password_for = password_for  # callsign -> password, or None to leave a message alone
+        self.host = host
+        self.port = port or (DEFAULT_UDP_PORT if udp else DEFAULT_TCP_PORT)
+        self.udp = udp
+        self.notify = notify  # Called as notify((kind, payload)) from the bridge thread
+        self.record = record  # Path to append raw received traffic to
+        self.reconnect = reconnect
+        self.callsign = None  # Our own callsign, asked from JS8Call on connect
+        self._loop = None
+        self._outgoing = None
+        self._thread = None
+        self._stopping = False
+
+    def _emit(self, kind, payload=None):
+        if self.notify is not None:
+            self.notify((kind, payload))
+
+    # Thread-side API
+    def start(self):
+        """Runs the bridge on a daemon thread."""
+        self._stopping = False
+        if self._thread is not None and self._thread.is_alive():
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._thread_main, args=(ready,), daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _thread_main(self, ready):
+        self._loop = asyncio.new_event_loop()
+        self._outgoing = asyncio.Queue()
+        ready.set()
+        try:
+            self._loop.run_until_complete(self.run())
+        finally:
+            self._loop.close()
+
+    def stop(self):
+        self._stopping = True
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._outgoing.put_nowait, None)
+
+    def send(self, text, to, password):
+        """Queues a plaintext message for `to`; safe to call from any thread."""
+        if self._loop is None:
+            raise RuntimeError("The bridge is not running.")
+        self._loop.call_soon_threadsafe(self._outgoing.put_nowait, (text, to, password))
+
+    # Loop-side implementation
+    async def run(self):
+        if self._outgoing is None:
+            self._outgoing = asyncio.Queue()
+        while not self._stopping:
+            try:
+                link = await (_UdpLink if self.udp else _TcpLink).open(self.host, self.port)
+            except OSError as e:
+                self._emit("error", e)
+            else:
+                self._emit("connected", f"{self.host}:{self.port}")
+                await self._serve(link)
+                self._emit("disconnected", None)
+            if not self.reconnect or self._stopping:
+                break
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _serve(self, link):
+        if not self.udp:
+            await link.send(json.dumps({"type": "STATION.GET_CALLSIGN", "value": ""}))
+        receiving = asyncio.ensure_future(self._receive_loop(link))
+        sending = asyncio.ensure_future(self._send_loop(link))
+        done, pending = await asyncio.wait({receiving, sending}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        link.close()
+        for task in done:
+            if task.exception() is not None:
+                self._emit("error", task.exception())
+
+    async def _receive_loop(self, link):
+        while True:
+            line = await link.receive()
+            if line is None:
+                return
+            line = line.strip()
+            if not line:
+                continue
+            if self.record:
+                with open(self.record, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            await self.handle(message)
+
+    async def handle(self, message):
+        kind = message.get("type")
+        if kind == "STATION.CALLSIGN":
+            self.callsign = message.get("value") or None
+        elif kind == "RX.DIRECTED":
+            params = message.get("params", {})
+            sender, to, payload = split_directed(message.get("value") or params.get("TEXT", ""))
+            sender = params.get("FROM", sender)
+            to = params.get("TO", to)
+            if self.callsign and to != self.callsign and not to.startswith("@"):
+                return  # Heard, but meant for another station (groups like @ALLCALL are for everybody)
+            received = Received(sender, to, params.get("UTC"), payload, None)
+            password = self.password_for(sender)
+            if password and payload:
+                loop = asyncio.get_running_loop()
+                try:
+                    codec = await loop.run_in_executor(None, self.codec_for, sender)
+                    received.text = await loop.run_in_executor(None, self.decode, payload, password, codec)
+                except Exception as e:
+                    self._emit("error", e)
+            self._emit("received", received)
+
+    async def _send_loop(self, link):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._outgoing.get()
+            if item is None:
+                return
+            text, to, password = item
+            try:
+                codec = await loop.run_in_executor(None, self.codec_for, to)
+                payload = await loop.run_in_executor(None, codec.encode, text, password)
+            except Exception as e:
+                self._emit("error", e)  # Only this message is lost; the queue keeps being served
+                continue
+            await link.send(json.dumps({"type": "TX.SEND_MESSAGE", "value": f"{to} {payload}",
+                                        "params": {"_ID": int(time.time() * 1000)}}))
+            self._emit("sent", (to, payload))
+
+# =============================================
+# STAND-IN SERVER
+# =============================================
+class ReplayServer:
+    """Plays back recorded JS8Call API traffic to every TCP client that connects."""
+
+    def __init__(self, messages, host=DEFAULT_HOST, port=DEFAULT_TCP_PORT, delay=0.0, callsign=None):
+        self.messages = messages  # Raw JSON lines, in the order JS8Call sent them
+        self.host = host
+        self.port = port
+        self.delay = delay        # Seconds between replayed messages
+        self.callsign = callsign  # Answer to STATION.GET_CALLSIGN
+        self.received = []        # Decoded JSON of everything clients sent
+        self._server = None
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, encoding="utf-8") as file:
+            return cls([line.strip() for line in file if line.strip()], **kwargs)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # In case port 0 was asked for
+        return self
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _client(self, reader, writer):
+        listener = asyncio.ensure_future(self._listen(reader, writer))
+        try:
+            for line in self.messages:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(line.encode("utf-8") + b"\n")
+                await writer.drain()
+            await listener
+        except ConnectionError:
+            pass
+        finally:
+            listener.cancel()
+            writer.close()
+
+    async def _listen(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            self.received.append(message)
+            if message.get("type") == "STATION.GET_CALLSIGN" and self.callsign:
+                writer.write(json.dumps({"type": "STATION.CALLSIGN", "value": self.callsign}).encode("utf-8") + b"\n")
+                await writer.drain()
\ No newline at end of file
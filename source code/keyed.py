@@ -0,0 +1,136 @@
+"""Keyed dictionary permutation.
+
+Instead of shuffling database.txt and sending the result to every
+station, stations share the plain base dictionary and a seed
+(passphrase). The seed keys a pseudorandom permutation of the entries:
+with words and codes of the base dictionary each sorted, word i gets
+code P(i). Every station computes the same mapping, one lookup at a
+time, whatever the line order of its copy of the base file, and
+changing the seed rotates to a new dictionary without any file
+transfer.
+
+P is a Feistel network over Z_m x Z_m (m = ceil(sqrt(n))) with
+HMAC-SHA256 round functions, walked until it lands inside the n entries.
+Round functions only take values below m, so they are tabulated when the
+key is set and a lookup is a few additions.
+The key comes from the seed through PBKDF2, so a weak seed costs an
+attacker time per guess.
+"""
+import hashlib
+import hmac
+import math
+from functools import lru_cache
+
+from dictcache import MEMO_LIMIT
+
+ROUNDS = 8
+KDF_SALT = b"JackRabbit keyed dictionary v1"
+KDF_ITERATIONS = 200_000
+
+@lru_cache(maxsize=8)
+def derive_key(seed):
+    return hashlib.pbkdf2_hmac("sha256", seed.encode("utf-8"), KDF_SALT, KDF_ITERATIONS)
+
+class KeyedPermutation:
+    """A keyed bijection of range(n) with O(1) forward and inverse lookups."""
+
+    def __init__(self, key, n):
+        self.n = n
+        self.m = max(2, math.isqrt(max(n - 1, 0)) + 1)  # m * m >= n
+        # A round function only ever sees values below m, so it is tabulated once
+        self._rounds = [[int.from_bytes(hmac.digest(key, bytes([r]) + x.to_bytes(4, "big"), "sha256")[:8], "big") % self.m
+                         for x in range(self.m)]
+                        for r in range(ROUNDS)]
+
+    def _encrypt(self, x):
+        m = self.m
+        left, right = divmod(x, m)
+        for table in self._rounds:
+            left, right = right, (left + table[right]) % m
+        return left * m + right
+
+    def _decrypt(self, x):
+        m = self.m
+        left, right = divmod(x, m)
+        for table in reversed(self._rounds):
+            left, right = (right - table[left]) % m, left
+        return left * m + right
+
+    def forward(self, i):
+        # Cycle walking: values outside range(n) are permuted again
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+    def inverse(self, j):
+        x = self._decrypt(j)
+        while x >= self.n:
+            x = self._decrypt(x)
+        return x
+
+class KeyedTable:
+    """Read-only mapping that computes entries through the permutation on demand."""
+
+    def __init__(self, keys, key_index, values, lookup):
+        self._keys = keys            # Keys in base order
+        self._key_index = key_index  # key -> position in base order
+        self._values = values        # Values in base order
+        self._lookup = lookup        # Position of a key -> position of its value
+        self._memo = {}
+
+    def get(self, key, default=None):
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        index = self._key_index.get(key)
+        if index is None:
+            return default  # Not remembered, so misses cannot grow the memo
+        value = self._values[self._lookup(index)]
+        if len(self._memo) >= MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = value
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self._key_index
+
+    def __len__(self):
+        return len(self._key_index)
+
+    def __iter__(self):
+        return iter(self._key_index)
+
+    def keys(self):
+        return iter(self._key_index)
+
+    def items(self):
+        for key in self._key_index:
+            yield key, self.get(key)
+
+    def values(self):
+        for key in self._key_index:
+            yield self.get(key)
+
+class KeyedDictionary:
+    """Base dictionary + seed -> (reference, reverse) tables for the Codec."""
+
+    def __init__(self, base_dictionary, seed):
+        words = sorted(base_dictionary.keys())
+        codes = sorted(base_dictionary.values())
+        self.permutation = KeyedPermutation(derive_key(seed), len(words))
+        word_index = {word: i for i, word in enumerate(words)}
+        code_index = {code: j for j, code in enumerate(codes)}
+        self.reference = KeyedTable(words, word_index, codes, self.permutation.forward)
+        self.reverse = KeyedTable(codes, code_index, words, self.permutation.inverse)
+
+    def materialize(self):
+        """The keyed dictionary as a plain dict, e.g. to write it out for older versions."""
+        return dict(self.reference.items())
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""Per-contact passwords and dictionary profiles.
+
+A small JSON file (keyring.json next to the scripts) maps callsigns to
+the password agreed with that station, plus an optional default for
+everybody else. Profiles name a dictionary (one per net) together with
+a reference to the keyring password used on it, and stations can be
+assigned to a profile:
+
+    {"default": "NETPASS",
+     "contacts": {"KN4CRD": "SECRET"},
+     "profiles": {"NET2": {"dictionary": "net2.txt", "password": "default", "seed": null}},
+     "assignments": {"W1AW": "NET2"}}
+
+Portable and other suffixes ("KN4CRD/P") use the base callsign's entry.
+The file is written like the dictionary (temporary file, then replace)
+and readable by its owner only.
+"""
+import json
+import os
+
+from codec import atomic_write
+
+DEFAULT_KEYRING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keyring.json")
+PROFILE_FIELDS = ("dictionary", "password", "seed")
+
+def base_callsign(callsign):
+    """'kn4crd/p' -> 'KN4CRD'."""
+    return callsign.strip().upper().split("/")[0]
+
+class Profile:
+    """A net: its dictionary file, optional seed and which keyring password it uses."""
+
+    def __init__(self, name, dictionary, password=None, seed=None):
+        self.name = name
+        self.dictionary = dictionary  # Path, relative paths are relative to the keyring file
+        self.password = password      # Keyring entry to take the password from: a callsign or "default"
+        self.seed = seed              # See keyed.py
+
+    @classmethod
+    def from_json(cls, name, fields):
+        """Profile from its keyring entry; raises ValueError for a malformed one."""
+        if not isinstance(fields, dict):
+            raise ValueError(f"profile '{name}' is not an object")
+        unknown = set(fields) - set(PROFILE_FIELDS)
+        if unknown:
+            raise ValueError(f"profile '{name}' has unknown field(s) {', '.join(sorted(unknown))}")
+        if not isinstance(fields.get("dictionary"), str) or not fields["dictionary"]:
+            raise ValueError(f"profile '{name}' needs a dictionary file name")
+        for field in ("password", "seed"):
+            if fields.get(field) is not None and not isinstance(fields[field], str):
+                raise ValueError(f"profile '{name}' has a {field} that is not a string")
+        return cls(name, **fields)
+
+    def to_json(self):
+        return {"dictionary": self.dictionary, "password": self.password, "seed": self.seed}
+
+class Keyring:
+    def __init__(self, contacts=None, default=None, path=DEFAULT_KEYRING_PATH, profiles=None, assignments=None):
+        self.contacts = {base_callsign(call): password for call, password in (contacts or {}).items()}
+        self.default = default
+        self.path = path
+        self.profiles = {name: Profile.from_json(name, fields) for name, fields in (profiles or {}).items()}
+        self.assignments = {base_callsign(call): name for call, name in (assignments or {}).items()}
+
+    @classmethod
+    def load(cls, path=DEFAULT_KEYRING_PATH):
+        """Reads a keyring file; a missing file is an empty keyring.
+
+        Raises ValueError, naming the file, if it is not a valid keyring.
+        """
+        if not os.path.exists(path):
+            return cls(path=path)
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                data = json.load(file)
+            except ValueError as e:
+                raise ValueError(f"Invalid keyring file {os.path.basename(path)}: {e}")
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("not a JSON object")
+            for section in ("contacts", "profiles", "assignments"):
+                if not isinstance(data.get(section) or {}, dict):
+                    raise ValueError(f"'{section}' is not an object")
+            return cls(data.get("contacts"), data.get("default"), path, data.get("profiles"), data.get("assignments"))
+        except ValueError as e:
+            raise ValueError(f"Invalid keyring file {os.path.basename(path)}: {e}")
+
+    def save(self, path=None):
+        with atomic_write(path or self.path, permissions=0o600, encoding="utf-8") as file:
+            json.dump({"default": self.default, "contacts": self.contacts,
+                       "profiles": {name: profile.to_json() for name, profile in self.profiles.items()},
+                       "assignments": self.assignments}, file, indent=2, sort_keys=True)
+
+    def entry(self, reference):
+        """Password stored under a callsign, or the default for "default"."""
+        if reference is None or reference.lower() == "default":
+            return self.default
+        return self.contacts.get(base_callsign(reference))
+
+    def password_for(self, callsign):
+        """Password for a station: its own, its profile's, the default one, or None."""
+        if callsign:
+            password = self.contacts.get(base_callsign(callsign))
+            if password:
+                return password
+            profile = self.profile_for(callsign)
+            if profile is not None and profile.password:
+                return self.entry(profile.password)
+        return self.default
+
+    def profile_for(self, callsign):
+        """The profile a station is assigned to, or None for the default dictionary."""
+        return self.profiles.get(self.assignments.get(base_callsign(callsign))) if callsign else None
+
+    def dictionary_path(self, profile):
+        """Absolute dictionary path of a profile."""
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)), profile.dictionary)
+
+    def add_profile(self, profile):
+        self.profiles[profile.name] = profile
+
+    def remove_profile(self, name):
+        self.assignments = {call: assigned for call, assigned in self.assignments.items() if assigned != name}
+        return self.profiles.pop(name, None) is not None
+
+    def assign(self, callsign, name):
+        """Puts a station on a profile; None puts it back on the default dictionary."""
+        if name is None:
+            self.assignments.pop(base_callsign(callsign), None)
+        elif name not in self.profiles:
+            raise ValueError(f"No profile named '{name}'.")
+        else:
+            self.assignments[base_callsign(callsign)] = name
+
+    def set(self, callsign, password):
+        self.contacts[base_callsign(callsign)] = password
+
+    def remove(self, callsign):
+        return self.contacts.pop(base_callsign(callsign), None) is not None
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""Batch and follow-mode decoding of JS8Call DIRECTED.TXT logs.
+
+JS8Call appends every directed message it hears to DIRECTED.TXT, one
+tab-separated line each:
+
+    2024-05-01 18:02:11<TAB>7.078000<TAB>1500<TAB>-12<TAB>KN4CRD: N0CALL  Q1@ 7X ♢
+
+LogFollower reads only what was appended since the last run (the offset
+is kept in a small state file next to the log), picks each sender's
+password and dictionary from the keyring and decodes the new messages.
+A large backlog is spread over a process pool, each worker loading a
+dictionary once; a few new lines are decoded in-process. Results are keyed by
+(callsign, timestamp).
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from codeccache import CodecCache
+from js8bridge import split_directed
+
+POOL_THRESHOLD = 200  # Fewer pending messages than this are not worth starting workers
+POLL_INTERVAL = 1.0
+
+class LogEntry:
+    """One DIRECTED.TXT line and, once decoded, its text."""
+
+    def __init__(self, timestamp, frequency, offset, snr, sender, to, payload):
+        self.timestamp = timestamp  # "YYYY-MM-DD HH:MM:SS" UTC, as logged
+        self.frequency = frequency  # Dial frequency in MHz
+        self.offset = offset        # Audio offset in Hz
+        self.snr = snr
+        self.sender = sender
+        self.to = to
+        self.payload = payload
+        self.text = None            # Decoded text; None if no password or not decoded
+        self.corrections = 0        # Tokens repaired by the tolerant decoder
+
+    @property
+    def key(self):
+        return self.sender, self.timestamp
+
+def parse_directed_line(line):
+    """LogEntry for a DIRECTED.TXT line, or None if it is not a directed message."""
+    fields = line.rstrip("\r\n").split("\t")
+    if len(fields) < 5:
+        return None
+    sender, to, payload = split_directed(fields[-1])
+    if not sender or not to:
+        return None
+    return LogEntry(fields[0].strip(), fields[1].strip(), fields[2].strip(), fields[3].strip(), sender, to, payload)
+
+def read_new_lines(path, offset):
+    """Complete lines appended after offset, and the offset to continue from.
+
+    A log that is now shorter than offset was rotated or cleared and is
+    read from the start. A partially written last line is left for the
+    next call.
+    """
+    size = os.path.getsize(path)
+    if size < offset:
+        offset = 0
+    with open(path, "rb") as file:
+        file.seek(offset)
+        data = file.read()
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8", errors="replace").splitlines()
+    return lines, offset + end
+
+# =============================================
+# DECODING
+# =============================================
+_codecs = CodecCache()  # Per process, so each worker loads a dictionary once
+
+def _decode_job(job):
+    database_path, seed, payload, password = job
+    decoder = _codecs.decoder(database_path, seed)
+    text, corrections = decoder.decode(payload, password)
+    return text, sum(1 for correction in corrections if correction.applied)
+
+def decode_entries(entries, keyring, database_path, seed=None, workers=None, pool_threshold=POOL_THRESHOLD):
+    """Decodes entries in place; returns them keyed by (callsign, timestamp).
+
+    Stations assigned to a keyring profile are decoded with that
+    profile's dictionary, everybody else with database_path.
+    """
+    pending = []
+    for entry in entries:
+        password = keyring.password_for(entry.sender)
+        if not password or not entry.payload:
+            continue
+        profile = keyring.profile_for(entry.sender)
+        if profile is not None:
+            job = (keyring.dictionary_path(profile), profile.seed, entry.payload, password.upper())
+        else:
+            job = (os.path.abspath(database_path), seed, entry.payload, password.upper())
+        pending.append((entry, job))
+    jobs = [job for _, job in pending]
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) >= pool_threshold and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_decode_job, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        results = [_decode_job(job) for job in jobs]
+    for (entry, _), (text, corrections) in zip(pending, results):
+        entry.text = text
+        entry.corrections = corrections
+    return {entry.key: entry for entry in entries}
+
+# =============================================
+# FOLLOWING
+# =============================================
+class LogFollower:
+    """Decodes what was appended to a DIRECTED.TXT since the last run."""
+
+    def __init__(self, log_path, keyring, database_path, seed=None, state_path=None, workers=None):
+        self.log_path = log_path
+        self.keyring = keyring
+        self.database_path = database_path
+        self.seed = seed
+        self.state_path = state_path or log_path + ".jrpos"
+        self.workers = workers
+
+    def load_offset(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as file:
+                return int(json.load(file).get("offset", 0))
+        except (OSError, ValueError):
+            return 0
+
+    def save_offset(self, offset):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"log": os.path.abspath(self.log_path), "offset": offset}, file)
+        os.replace(temp_path, self.state_path)
+
+    def reset(self):
+        self.save_offset(0)
+
+    def poll(self):
+        """Decodes the lines appended since the saved offset, then saves the new one."""
+        lines, offset = read_new_lines(self.log_path, self.load_offset())
+        entries = [entry for entry in map(parse_directed_line, lines) if entry is not None]
+        decoded = decode_entries(entries, self.keyring, self.database_path, self.seed, self.workers)
+        self.save_offset(offset)
+        return decoded
+
+    def follow(self, interval=POLL_INTERVAL):
+        """Yields the decoded backlog first, then new messages as they are logged."""
+        while True:
+            decoded = self.poll()
+            if decoded:
+                yield decoded
+            time.sleep(interval)
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""Error-tolerant decoding for corrupted receptions.
+
+A single flipped character turns a code into a token the reverse
+dictionary does not know, and the word is lost. NearestCodeIndex is a
+deletion-neighbourhood index over all codes: every code is stored under
+each of its one-character deletions, so the codes within one edit
+(substitution, insertion, deletion or swap of neighbours) of a received
+token are found with a handful of dict lookups, whatever the dictionary
+size.
+
+Only tokens of code size (up to one character longer than the longest
+code) are considered. Tokens carrying one of the special characters are
+almost certainly codes and are corrected when the match is unique;
+bare tokens may be plain words or numbers sent verbatim, so they only
+get a suggestion unless the threshold is lowered. Bare tokens that are
+all letters or no longer than a code (HOW, ARE, MY) are nearly always
+such words and get no suggestion at all, and suggestions below
+SUGGEST_THRESHOLD are dropped rather than shown.
+"""
+from codec import JOIN, SPECIAL_CHARS, restore_token, vigenere_like_decrypt
+
+SPECIAL_SET = set(SPECIAL_CHARS)
+AUTO_CORRECT_THRESHOLD = 0.75
+SUGGEST_THRESHOLD = 0.25  # Weaker suggestions are not worth showing
+BARE_MIN_LENGTH = 4  # Shorter bare tokens are read as verbatim words
+
+def deletions(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+def within_one_edit(a, b):
+    """True if a and b differ by one substitution, insertion, deletion or adjacent swap."""
+    if a == b:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+    if abs(len(a) - len(b)) != 1:
+        return False
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return shorter in deletions(longer)
+
+class NearestCodeIndex:
+    def __init__(self, codes):
+        self.codes = set(codes)
+        self.max_length = max((len(code) for code in self.codes), default=0)
+        self._index = {}
+        for code in self.codes:
+            for variant in deletions(code):
+                self._index.setdefault(variant, []).append(code)
+
+    def candidates(self, token):
+        """Codes exactly one edit away from token."""
+        found = set()
+        if token in self._index:  # token lost a character
+            found.update(self._index[token])
+        for variant in deletions(token):
+            if variant in self.codes:  # token gained a character
+                found.add(variant)
+            found.update(self._index.get(variant, ()))  # substitution or swap
+        return sorted(code for code in found if within_one_edit(token, code))
+
+    def suggest(self, token):
+        """(code, confidence) of the most likely intended code, or (None, 0.0)."""
+        if not token or len(token) > self.max_length + 1 or token in self.codes:
+            return None, 0.0
+        special = bool(SPECIAL_SET.intersection(token))
+        if not special and (token.isalpha() or len(token) < BARE_MIN_LENGTH):
+            return None, 0.0  # A plain word sent verbatim, not a damaged code
+        candidates = self.candidates(token)
+        if not candidates:
+            return None, 0.0
+        if len(candidates) > 1:
+            # A dropped or extra character would also shift the key for the rest of
+            # the message, so a substitution or swap is the likelier explanation
+            same_length = [code for code in candidates if len(code) == len(token)]
+            if same_length:
+                candidates = same_length
+        if len(candidates) > 1:
+            # Prefer candidates that keep the token's special character where it was
+            same_shape = [code for code in candidates
+                          if [c in SPECIAL_SET for c in code] == [c in SPECIAL_SET for c in token]]
+            if same_shape:
+                candidates = same_shape
+        weight = 1.0 if special else 0.5
+        return candidates[0], weight / len(candidates)
+
+class Correction:
+    """A received token that did not match any code exactly."""
+
+    def __init__(self, position, start, end, received, word, confidence, applied):
+        self.position = position      # Word index in the decoded text
+        self.start = start            # Character offsets in the decoded text
+        self.end = end
+        self.received = received      # Token as decrypted
+        self.word = word              # Most likely word
+        self.confidence = confidence  # 0..1
+        self.applied = applied        # Replaced in the output, or only suggested
+
+class TolerantDecoder:
+    """Decodes like Codec.decode() but repairs tokens one edit away from a code."""
+
+    def __init__(self, codec, threshold=AUTO_CORRECT_THRESHOLD, floor=SUGGEST_THRESHOLD):
+        self.codec = codec
+        self.threshold = threshold  # Corrections at least this sure are applied
+        self.floor = floor          # Weaker ones are not reported at all
+        self._index = (None, None)  # (reverse table it was built from, index)
+
+    def index(self, reverse):
+        if self._index[0] is not reverse:
+            self._index = (reverse, NearestCodeIndex(reverse.keys()))
+        return self._index[1]
+
+    def restore(self, text, reverse=None):
+        """Returns (decoded text, corrections) for an already decrypted payload."""
+        if reverse is None:
+            reverse = self.codec.reverse
+        index = self.index(reverse)
+        words = []
+        corrections = []
+        offset = 0
+        for position, token in enumerate(text.split()):
+            word = reverse.get(token)
+            correction = None
+            if word is None and JOIN in token:
+                word = restore_token(token, reverse)  # Composed or escaped word, not a damaged code
+            if word is None:
+                code, confidence = index.suggest(token)
+                if code is not None and confidence >= min(self.floor, self.threshold):
+                    correction = (reverse[code].lower(), confidence, confidence >= self.threshold)
+                word = correction[0] if correction and correction[2] else token
+            word = word.lower()
+            if correction:
+                corrections.append(Correction(position, offset, offset + len(word), token, *correction))
+            words.append(word)
+            offset += len(word) + 1
+        return ' '.join(words), corrections
+
+    def decode(self, text, password):
+        return self.restore(vigenere_like_decrypt(text.strip().upper(), password.upper()))
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Dictionary delta patches that can be sent over JS8Call.
+
+When the Manager adds a few words, peers should not need the whole new
+database.txt. make_patch() compares two versions and emits only the
+removed, re-coded and added entries, compressed and written with
+uppercase letters and digits only (base32 without padding), so the patch
+survives a JS8Call free-text message:
+
+    JRP1 <FROM> <TO> <CRC> <LINES>
+    01 <BASE32 ...>
+    02 <BASE32 ...>
+
+FROM and TO are version hashes of the dictionaries before and after, CRC
+is a CRC32 of the decoded body. Body lines are numbered so a missing or
+reordered line is noticed. apply_patch() refuses a patch for another
+version and checks that the result hashes to TO, so a peer either ends
+up with exactly the sender's dictionary or keeps its own.
+"""
+import base64
+import hashlib
+import zlib
+
+from reloader import diff_dictionaries
+
+PATCH_MAGIC = "JRP1"
+LINE_LENGTH = 48  # Base32 characters per body line
+
+def dictionary_version(dictionary):
+    """Short hash of the dictionary as write_dictionary() would save it, line order included."""
+    digest = hashlib.sha256()
+    for word, code in dictionary.items():
+        digest.update(f"{word}: {code}\n".encode("utf-8"))
+    return digest.hexdigest()[:8].upper()
+
+def _delta_records(source, target):
+    """Records turning source into target, or None if target reorders existing entries."""
+    diff = diff_dictionaries(source, target)
+    records = [f"-{word}" for word in diff.removed]
+    records.extend(f"={word}: {new}" for word, (_, new) in diff.changed.items())
+    records.extend(f"+{word}: {code}" for word, code in diff.added.items())
+    if list(_apply_records(source, records)) != list(target):
+        return None
+    return records
+
+def _apply_records(dictionary, records):
+    result = dict(dictionary)
+    for record in records:
+        if record == "*":  # Full replacement follows
+            result = {}
+            continue
+        operation, entry = record[0], record[1:]
+        if operation == "-":
+            if entry not in result:
+                raise ValueError(f"Patch removes '{entry}', which is not in the dictionary.")
+            del result[entry]
+            continue
+        word, _, code = entry.partition(": ")
+        if operation == "=" and word not in result:
+            raise ValueError(f"Patch changes '{word}', which is not in the dictionary.")
+        if operation == "+" and word in result:
+            raise ValueError(f"Patch adds '{word}', which is already in the dictionary.")
+        if operation not in "=+":
+            raise ValueError(f"Unknown patch record: {record}")
+        result[word] = code
+    return result
+
+def _pack(records):
+    raw = "\n".join(records).encode("utf-8")
+    packed = zlib.compress(raw, 9)
+    # Tiny patches come out smaller without the zlib header
+    body = b"Z" + packed if len(packed) < len(raw) else b"R" + raw
+    return base64.b32encode(body).decode("ascii").rstrip("=")
+
+def _unpack(text):
+    body = base64.b32decode(text + "=" * (-len(text) % 8))
+    kind, data = body[:1], body[1:]
+    if kind == b"Z":
+        data = zlib.decompress(data)
+    elif kind != b"R":
+        raise ValueError("Unknown patch encoding.")
+    data = data.decode("utf-8")
+    return data.split("\n") if data else []
+
+def make_patch(source, target):
+    """JS8Call-safe text that turns the source dictionary into the target one."""
+    records = _delta_records(source, target)
+    if records is None:
+        # Reordered (e.g. ranked) dictionary: send every entry
+        records = ["*"] + [f"+{word}: {code}" for word, code in target.items()]
+    body = _pack(records)
+    crc = zlib.crc32(body.encode("ascii"))
+    lines = [body[i:i + LINE_LENGTH] for i in range(0, len(body), LINE_LENGTH)]
+    header = f"{PATCH_MAGIC} {dictionary_version(source)} {dictionary_version(target)} {crc:08X} {len(lines)}"
+    return "\n".join([header] + [f"{number:02d} {line}" for number, line in enumerate(lines, 1)])
+
+def read_patch(text):
+    """(from version, to version, records) of a patch. Raises ValueError if it is damaged."""
+    header = None
+    numbered = {}
+    for line in text.upper().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == PATCH_MAGIC:
+            if len(parts) != 5:
+                raise ValueError("Malformed patch header.")
+            header = parts
+        elif len(parts) == 2 and parts[0].isdigit():
+            numbered[int(parts[0])] = parts[1]
+        else:
+            raise ValueError(f"Unexpected line in patch: {line}")
+    if header is None:
+        raise ValueError("No JRP1 patch header found.")
+    _, source_version, target_version, crc, count = header
+    missing = [number for number in range(1, int(count) + 1) if number not in numbered]
+    if missing:
+        raise ValueError(f"Patch lines missing: {', '.join(map(str, missing))}")
+    body = "".join(numbered[number] for number in range(1, int(count) + 1))
+    if f"{zlib.crc32(body.encode('ascii')):08X}" != crc:
+        raise ValueError("Patch checksum mismatch; the patch was damaged in transit.")
+    return source_version, target_version, _unpack(body)
+
+def apply_patch(dictionary, text):
+    """Returns the patched dictionary; the input dictionary is left alone."""
+    source_version, target_version, records = read_patch(text)
+    version = dictionary_version(dictionary)
+    if version == target_version:
+        return dict(dictionary)  # Already up to date
+    if version != source_version:
+        raise ValueError(f"Patch is for dictionary version {source_version}, this one is {version}.")
+    result = _apply_records(dictionary, records)
+    if dictionary_version(result) != target_version:
+        raise ValueError("Patched dictionary does not match the target version.")
+    return result
\ No newline at end of file
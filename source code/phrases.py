@@ -0,0 +1,105 @@
+"""Multi-word phrase entries.
+
+A dictionary line like "how are you: Q1@" makes the encoder send one code
+for the whole phrase (see the trie in codec.py). This module finds
+phrases worth adding, by mining frequent n-grams from a corpus, and
+measures what phrases save on real messages.
+"""
+from collections import Counter
+
+from allocator import CODE_LENGTH
+from codec import PUNCTUATION_TABLE
+from ingest import ingest_words
+
+class PhraseCandidate:
+    """An n-gram that would save characters as a single code."""
+
+    def __init__(self, phrase, count, saving):
+        self.phrase = phrase
+        self.count = count    # Occurrences in the corpus
+        self.saving = saving  # Payload characters saved over the whole corpus
+
+    def __repr__(self):
+        return f"PhraseCandidate({self.phrase!r}, count={self.count}, saving={self.saving})"
+
+def cleaned_runs(text):
+    """Cleaned lowercase words, split into runs at tokens that are only punctuation."""
+    run = []
+    for word in text.lower().split():
+        cleaned = word.translate(PUNCTUATION_TABLE)
+        if cleaned:
+            run.append(cleaned)
+        elif run:
+            yield run
+            run = []
+    if run:
+        yield run
+
+def validate_phrase(phrase, dictionary):
+    """Returns why a phrase cannot be added, or None if it can."""
+    words = phrase.split()
+    if len(words) < 2 or not all(word.isalpha() for word in words) or phrase != ' '.join(words):
+        return f"Phrase '{phrase}' is invalid. Must be 2 or more alphabetic words separated by single spaces."
+    if phrase in dictionary:
+        return f"Phrase '{phrase}' already exists in the dictionary."
+    return None
+
+def mine_phrases(texts, reference, min_words=2, max_words=4, min_count=3, top=25):
+    """Most valuable n-grams of the corpus that are not in the dictionary yet.
+
+    The value of an n-gram is how many payload characters a 3-character
+    code would save on each occurrence, times the number of occurrences.
+    """
+    counts = Counter()
+    for text in texts:
+        for run in cleaned_runs(text):
+            for size in range(min_words, max_words + 1):
+                for i in range(len(run) - size + 1):
+                    counts[tuple(run[i:i + size])] += 1
+
+    candidates = []
+    for words, count in counts.items():
+        if count < min_count:
+            continue
+        phrase = ' '.join(words)
+        if validate_phrase(phrase, reference) is not None:
+            continue
+        current = sum(len(reference.get(word) or word) for word in words) + len(words) - 1
+        saving = (current - CODE_LENGTH) * count
+        if saving > 0:
+            candidates.append(PhraseCandidate(phrase, count, saving))
+    candidates.sort(key=lambda candidate: (-candidate.saving, candidate.phrase))
+    return candidates[:top]
+
+def add_phrases(dictionary, phrases, allocator, path, progress=None):
+    """Allocates codes for phrases and writes the dictionary once (see ingest_words)."""
+    return ingest_words(dictionary, phrases, allocator, path, progress, validate=validate_phrase)
+
+# =============================================
+# PAYLOAD REPORT
+# =============================================
+def payload_report(codec, messages):
+    """Per message: (message, plain characters, payload without phrases, payload with phrases)."""
+    reference = codec.reference
+    rows = []
+    for message in messages:
+        message = message.strip()
+        if not message:
+            continue
+        words_only, _ = codec.substitute(message, reference, phrases=False)
+        with_phrases, _ = codec.substitute(message, reference)
+        rows.append((message, len(message), len(words_only), len(with_phrases)))
+    return rows
+
+def format_report(rows):
+    lines = [f"{'plain':>6} {'words':>6} {'phrases':>8} {'saved':>6}  message"]
+    total_words = total_phrases = 0
+    for message, plain, words_only, with_phrases in rows:
+        saved = (1 - with_phrases / words_only) * 100 if words_only else 0.0
+        lines.append(f"{plain:>6} {words_only:>6} {with_phrases:>8} {saved:>5.1f}%  {message[:50]}")
+        total_words += words_only
+        total_phrases += with_phrases
+    if total_words:
+        lines.append(f"Total: {total_words} -> {total_phrases} characters "
+                     f"({(1 - total_phrases / total_words) * 100:.1f}% smaller with phrases)")
+    return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Frequency-ranked code assignment.
+
+Random allocation gives a word used in every message the same 3-character
+code as a word used once a year, and leaves the 2-character codes mostly
+idle. rank_dictionary() counts how often each word is used in a corpus
+(message history, logs, ...) and hands the cheapest codes to the most
+frequent words:
+
+    2-character base codes, minus RESERVED_CODES    (cost 2)
+    special-character codes, by SPECIAL_CHARACTERS  (cost 3)
+
+A word only takes a code shorter than itself, unless it is already in
+the dictionary (every existing word stays encodable). Phrase entries keep
+their codes. Frequency only picks the cost tier: within a tier the codes
+are shuffled, so the result cannot be rebuilt from the corpus alone.
+"""
+import random
+from collections import Counter
+
+from codec import PUNCTUATION_TABLE
+from allocator import BASE_CODES, RESERVED_CODES, SPECIAL_CHARACTERS, make_code
+
+MIN_WORD_LENGTH = 3  # A 2-letter word cannot get shorter
+
+def code_pool():
+    """Every assignable code, cheapest first."""
+    pool = [code for code in BASE_CODES if code not in RESERVED_CODES]
+    for special_character in SPECIAL_CHARACTERS:
+        pool.extend(make_code(special_character, base) for base in BASE_CODES)
+    return pool
+
+def word_frequencies(texts):
+    """Counts cleaned lowercase words."""
+    counts = Counter()
+    for text in texts:
+        for word in text.lower().split():
+            cleaned = word.translate(PUNCTUATION_TABLE)
+            if cleaned:
+                counts[cleaned] += 1
+    return counts
+
+def average_cost(dictionary, frequencies):
+    """Expected payload characters per word, weighted by corpus frequency."""
+    total = sum(frequencies.values())
+    if not total:
+        return 0.0
+    cost = sum(count * len(dictionary.get(word, word)) for word, count in frequencies.items())
+    return cost / total
+
+class RankingResult:
+    def __init__(self, dictionary, before, after, added, dropped):
+        self.dictionary = dictionary  # The re-coded dictionary, most frequent words first
+        self.before = before          # Average characters per word with the old dictionary
+        self.after = after            # ... and with the new one
+        self.added = added            # Corpus words that were not in the dictionary before
+        self.dropped = dropped        # Corpus words left out for lack of codes
+
+    def summary(self):
+        saved = (1 - self.after / self.before) * 100 if self.before else 0.0
+        return (f"Average characters per word: {self.before:.3f} -> {self.after:.3f} ({saved:.1f}% less airtime). "
+                f"{self.added} words added, {self.dropped} left out.")
+
+def rank_dictionary(dictionary, frequencies, add_new_words=True, rng=None):
+    """Re-assigns codes so the most frequent words get the cheapest ones."""
+    rng = rng or random.SystemRandom()
+    phrases = {word: code for word, code in dictionary.items() if ' ' in word}
+    words = [word for word in dictionary if ' ' not in word]
+    existing = set(words)
+    if add_new_words:
+        words.extend(word for word, _ in frequencies.most_common()
+                     if word not in existing and word.isalpha() and len(word) >= MIN_WORD_LENGTH)
+    # Most frequent first; on ties the words already in the dictionary win
+    words.sort(key=lambda word: (-frequencies.get(word, 0), word not in existing, word))
+
+    taken = set(phrases.values())
+    pool = [code for code in code_pool() if code not in taken]
+    short_codes = [code for code in pool if len(code) == 2]
+    long_codes = [code for code in pool if len(code) != 2]
+    rng.shuffle(short_codes)
+    rng.shuffle(long_codes)
+
+    ranked = {}
+    dropped = 0
+    short_index = long_index = 0
+    for word in words:
+        if short_index < len(short_codes) and len(word) > 2:
+            ranked[word] = short_codes[short_index]
+            short_index += 1
+        elif long_index < len(long_codes) and (len(word) > 3 or word in existing):
+            ranked[word] = long_codes[long_index]
+            long_index += 1
+        elif word in existing:
+            raise ValueError("Not enough codes for the existing dictionary.")
+        else:
+            dropped += 1
+    ranked.update(phrases)
+
+    added = sum(1 for word in ranked if word not in dictionary)
+    return RankingResult(ranked, average_cost(dictionary, frequencies), average_cost(ranked, frequencies),
+                         added, dropped)
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Debounced hot-reload of the dictionary.
+
+File watchers fire several events per save (and the old Manager fired one
+per added word). DictionaryReloader waits until the events stop for
+`delay` seconds, reloads once on its own timer thread, diffs the result
+against the previous load and only publishes new tables when something
+actually changed. It never touches the GUI: results go to a notify
+callback, which the GUI points at a queue it drains on its own thread.
+
+With compiled tables (see dictcache.py) the sidecar header's hash of the
+text file tells whether anything changed, the cache is rebuilt at most
+once per change and the diff walks the old and new tables side by side;
+no parsed copy of the file is kept.
+"""
+import threading
+
+from codec import read_dictionary
+from dictcache import load_buffer, open_tables, source_digest
+
+class DictionaryDiff:
+    """Words added, removed and re-coded between two loads."""
+
+    def __init__(self, added, removed, changed):
+        self.added = added      # word -> code
+        self.removed = removed  # word -> old code
+        self.changed = changed  # word -> (old code, new code)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+
+def diff_dictionaries(old, new):
+    added = {word: code for word, code in new.items() if word not in old}
+    removed = {word: code for word, code in old.items() if word not in new}
+    changed = {word: (old[word], code) for word, code in new.items()
+               if word in old and old[word] != code}
+    return DictionaryDiff(added, removed, changed)
+
+def diff_sorted(old, new):
+    """diff_dictionaries() for two tables whose items() come in key order, in one merge pass."""
+    added, removed, changed = {}, {}, {}
+    old_items, new_items = iter(old.items()), iter(new.items())
+    old_item, new_item = next(old_items, None), next(new_items, None)
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+            removed[old_item[0]] = old_item[1]
+            old_item = next(old_items, None)
+        elif old_item is None or new_item[0] < old_item[0]:
+            added[new_item[0]] = new_item[1]
+            new_item = next(new_items, None)
+        else:
+            if old_item[1] != new_item[1]:
+                changed[new_item[0]] = (old_item[1], new_item[1])
+            old_item, new_item = next(old_items, None), next(new_items, None)
+    return DictionaryDiff(added, removed, changed)
+
+class DictionaryReloader:
+    """Coalesces reload requests for one Codec."""
+
+    def __init__(self, codec, delay=0.5, notify=None):
+        self.codec = codec
+        self.delay = delay
+        self.notify = notify  # Called as notify((kind, payload)) from the timer thread
+        self._timer = None
+        self._timer_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._snapshot = None  # The file as last loaded: a dict, or the compiled forward table
+        self._digest = None    # sha256 of that file, compiled tables only
+
+    def schedule(self):
+        """Asks for a reload; repeated calls within `delay` collapse into one."""
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def reset(self):
+        """Forgets the last load, e.g. after the codec was pointed at another file."""
+        with self._reload_lock:
+            self._snapshot = None
+            self._digest = None
+
+    def _run(self):
+        try:
+            diff = self.reload()
+        except Exception as e:
+            if self.notify is not None:
+                self.notify(("error", e))
+            return
+        if diff and self.notify is not None:
+            self.notify(("reloaded", diff))
+
+    def reload(self):
+        """Reloads now. Returns the diff; tables are only swapped if it is non-empty."""
+        with self._reload_lock:
+            if self.codec.compiled:
+                return self._reload_compiled()
+            dictionary = read_dictionary(self.codec.database_path)
+            diff = diff_dictionaries(self._snapshot or {}, dictionary)
+            if self._snapshot is not None and not diff:
+                return diff
+            self.codec.publish(*self.codec.key_tables(dictionary, {v: k for k, v in dictionary.items()}))
+            self._snapshot = dictionary
+            return diff
+
+    def _reload_compiled(self):
+        buffer = load_buffer(self.codec.database_path)  # Rebuilds the sidecar only if the file changed
+        digest = source_digest(buffer)
+        if self._snapshot is not None and digest == self._digest:
+            return DictionaryDiff({}, {}, {})
+        reference, reverse = open_tables(buffer)
+        if self._snapshot is None:
+            diff = DictionaryDiff(reference, {}, {})  # First load: everything is new, no need to copy it
+        else:
+            diff = diff_sorted(self._snapshot, reference)
+        self.codec.publish(*self.codec.key_tables(reference, reverse))
+        self._snapshot = reference
+        self._digest = digest
+        return diff
\ No newline at end of file
@@ -1,22 +1,17 @@
 import random
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
+
+from codec import read_dictionary, write_dictionary
+from keyed import KeyedDictionary
 
 # Function to shuffle the values in the dictionary
 def shuffle_dictionary(file_path):
     try:
-        # Read the original dictionary
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-
-        # Extract keys and values
-        keys = []
-        values = []
-        for line in lines:
-            # Split only on the first ": " to handle special characters in values
-            key, value = line.strip().split(': ', 1)
-            keys.append(key)
-            values.append(value)
+        # Read the original dictionary and extract keys and values
+        dictionary = read_dictionary(file_path)
+        keys = list(dictionary.keys())
+        values = list(dictionary.values())
 
         # Shuffle the keys (reference codes) independently
         random.shuffle(keys)
@@ -32,12 +27,20 @@ def shuffle_dictionary(file_path):
         messagebox.showerror("Error", f"Failed to shuffle dictionary: {e}")
         return None
 
+# Function to permute the dictionary with a passphrase. Every peer that has the
+# same base file and seed gets the same result, so nothing has to be sent;
+# the file is only needed for peers that cannot use a seed directly.
+def keyed_shuffle_dictionary(file_path, seed):
+    try:
+        return KeyedDictionary(read_dictionary(file_path), seed).materialize()
+    except Exception as e:
+        messagebox.showerror("Error", f"Failed to shuffle dictionary: {e}")
+        return None
+
 # Function to save the shuffled dictionary to a new file
 def save_shuffled_dict(shuffled_dict, output_path):
     try:
-        with open(output_path, 'w') as file:
-            for key, value in shuffled_dict.items():
-                file.write(f"{key}: {value}\n")
+        write_dictionary(shuffled_dict, output_path)
         messagebox.showinfo("Success", f"Shuffled dictionary saved to {output_path}!")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to save shuffled dictionary: {e}")
@@ -54,19 +57,40 @@ def shuffle_button_click():
         if output_file:
             save_shuffled_dict(shuffled_dict, output_file)
 
-# Create the main application window
-root = tk.Tk()
-root.title("Dictionary Shuffler v2")
-root.geometry("400x200")
-root.resizable(False, False)
+# Function to handle the keyed shuffle button click
+def keyed_shuffle_button_click():
+    input_file = filedialog.askopenfilename(title="Select Base Dictionary File", filetypes=[("Text Files", "*.txt")])
+    if not input_file:
+        return
+
+    seed = simpledialog.askstring("Dictionary Seed", "Shared dictionary seed:", show="*")
+    if not seed:
+        return
+
+    shuffled_dict = keyed_shuffle_dictionary(input_file, seed)
+    if shuffled_dict:
+        output_file = filedialog.asksaveasfilename(title="Save Keyed Dictionary", defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
+        if output_file:
+            save_shuffled_dict(shuffled_dict, output_file)
+
+if __name__ == "__main__":
+    # Create the main application window
+    root = tk.Tk()
+    root.title("Dictionary Shuffler v2")
+    root.geometry("400x220")
+    root.resizable(False, False)
+
+    # Add a label
+    label = tk.Label(root, text="Welcome to Dictionary Shuffler!", font=("Arial", 14))
+    label.pack(pady=20)
 
-# Add a label
-label = tk.Label(root, text="Welcome to Dictionary Shuffler!", font=("Arial", 14))
-label.pack(pady=20)
+    # Add the shuffle button
+    shuffle_button = tk.Button(root, text="Shuffle", font=("Arial", 12), bg="blue", fg="white", command=shuffle_button_click)
+    shuffle_button.pack(pady=(0, 10), ipadx=10, ipady=5)
 
-# Add the shuffle button
-shuffle_button = tk.Button(root, text="Shuffle", font=("Arial", 12), bg="blue", fg="white", command=shuffle_button_click)
-shuffle_button.pack(pady=20, ipadx=10, ipady=5)
+    # Add the keyed shuffle button
+    keyed_button = tk.Button(root, text="Keyed Shuffle", font=("Arial", 12), bg="blue", fg="white", command=keyed_shuffle_button_click)
+    keyed_button.pack(pady=(0, 10), ipadx=10, ipady=5)
 
-# Run the application
-root.mainloop()
\ No newline at end of file
+    # Run the application
+    root.mainloop()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scripts import each other as top-level modules from the folder above
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
\ No newline at end of file
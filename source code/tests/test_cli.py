@@ -0,0 +1,15 @@
+from cli import main
+from codec import write_dictionary
+
+def test_encrypt_and_decrypt_end_with_a_newline(tmp_path, capsys):
+    dictionary = str(tmp_path / "database.txt")
+    write_dictionary({"hello": "HE@", "world": "WO@"}, dictionary)
+    plain = tmp_path / "plain.txt"
+    plain.write_text("hello world again", encoding="utf-8")
+    main(["--dictionary", dictionary, "encrypt", "-p", "secret", "-i", str(plain)])
+    payload = capsys.readouterr().out
+    assert payload.endswith("\n") and payload.count("\n") == 1
+    cipher = tmp_path / "cipher.txt"
+    cipher.write_text(payload, encoding="utf-8")
+    main(["--dictionary", dictionary, "decrypt", "-p", "secret", "-i", str(cipher)])
+    assert capsys.readouterr().out == "hello world again\n"
\ No newline at end of file
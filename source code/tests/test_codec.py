@@ -0,0 +1,45 @@
+import os
+import time
+
+import pytest
+
+from codec import Codec, atomic_write, read_dictionary, write_dictionary
+
+DICTIONARY = {"house": "XC[", "sun": "SU@", "flower": "3D@", "self": "$SF", "test": "TE#", "world": "WO@"}
+
+def make_codec():
+    codec = Codec()
+    codec.set_dictionary(dict(DICTIONARY))
+    return codec
+
+def test_composed_words_round_trip():
+    codec = make_codec()
+    for word in ("houses", "sunflower", "sunflower."):
+        payload, _ = codec.substitute(word)
+        assert '+' in payload
+        assert codec.restore(payload) == word.rstrip(".")
+
+def test_words_with_inner_punctuation_are_sent_verbatim():
+    codec = make_codec()
+    for word in ("w1aw/portable", "user@example.com", "hello-world", "self-test"):
+        payload, _ = codec.substitute(word)
+        assert codec.restore(payload) == word
+        assert codec.substitute_tokens(codec.tokenize(word))[0] == payload
+
+def test_long_token_composes_quickly():
+    codec = make_codec()
+    blob = ("sunflower" + "house" + "xq") * 900  # About 14k characters without a space
+    start = time.perf_counter()
+    payload, _ = codec.substitute(blob)
+    assert time.perf_counter() - start < 2.0
+    assert codec.restore(payload) == blob
+
+def test_failed_atomic_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / "database.txt")
+    write_dictionary(DICTIONARY, path)
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as file:
+            file.write("half: written\n")
+            raise RuntimeError("disk full")
+    assert read_dictionary(path) == DICTIONARY
+    assert os.listdir(tmp_path) == ["database.txt"]
\ No newline at end of file
@@ -0,0 +1,17 @@
+import os
+
+from codec import write_dictionary
+from codeccache import CodecCache
+
+def test_decoder_is_shared_until_the_dictionary_changes(tmp_path):
+    path = str(tmp_path / "net2.txt")
+    write_dictionary({"hello": "HE@", "world": "WO@"}, path)
+    cache = CodecCache(compiled=False)
+    decoder = cache.decoder(path)
+    assert cache.decoder(path) is decoder
+    assert decoder.codec is cache.get(path)
+    write_dictionary({"hello": "HE@", "world": "WO@", "again": "AG#"}, path)
+    os.utime(path, ns=(0, 0))  # Make sure the change is seen even within one mtime tick
+    changed = cache.decoder(path)
+    assert changed is not decoder and changed.codec is cache.get(path)
+    assert changed.restore("HE@ AG#")[0] == "hello again"
\ No newline at end of file
@@ -0,0 +1,17 @@
+from codec import Codec, Composer, write_dictionary
+from dictcache import CompiledPieces
+
+DICTIONARY = {"house": "XC[", "sun": "SU@", "flower": "3D@", "flow": "FL#", "self": "$SF",
+              "-ing": "IN%", "-s": "S~", "good day": "GD&", "dup": "DU^", "twin": "DU^"}
+
+def test_compiled_tables_compose_like_the_dictionary(tmp_path):
+    path = str(tmp_path / "database.txt")
+    write_dictionary(DICTIONARY, path)
+    codec = Codec(path)
+    compiled = codec.composer()
+    plain = Composer(DICTIONARY, {code: word for word, code in DICTIONARY.items()})
+    assert isinstance(compiled.pieces, CompiledPieces)
+    assert compiled.max_piece == plain.max_piece
+    for word in ("houses", "sunflowering", "flowsun", "selfxhouse", "dupsun", "twinsun", "zz", "sunhous"):
+        assert compiled.compose(word) == plain.compose(word), word
+    assert codec.phrase_trie()[1] == 2
\ No newline at end of file
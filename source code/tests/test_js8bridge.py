@@ -0,0 +1,39 @@
+import asyncio
+
+from codec import Codec
+from js8bridge import JS8Bridge, ReplayServer
+
+def test_failed_encode_does_not_stop_sending():
+    codec = Codec()
+    codec.set_dictionary({"hello": "HE@", "world": "WO@"})
+
+    def codec_for(callsign):
+        if callsign == "BROKEN":
+            raise FileNotFoundError("net2.txt")
+        return codec
+
+    async def scenario():
+        server = await ReplayServer([], port=0, callsign="N0CALL").start()
+        events = []
+        bridge = JS8Bridge(codec, lambda callsign: None, port=server.port, notify=events.append,
+                           reconnect=False, codec_for=codec_for)
+        bridge.start()
+        try:
+            bridge.send("hello world", "BROKEN", "SECRET")
+            bridge.send("hello world", "KN4CRD", "SECRET")
+            for _ in range(200):
+                if any(kind == "sent" for kind, _ in events):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            bridge.stop()
+            await server.close()
+        return events, server.received
+
+    events, received = asyncio.run(scenario())
+    kinds = [kind for kind, _ in events]
+    assert "error" in kinds and "sent" in kinds
+    assert kinds.index("error") < kinds.index("sent")
+    sent = [message for message in received if message.get("type") == "TX.SEND_MESSAGE"]
+    assert len(sent) == 1 and sent[0]["value"].startswith("KN4CRD ")
+    assert codec.decode(sent[0]["value"].split(" ", 1)[1], "SECRET") == "hello world"
\ No newline at end of file
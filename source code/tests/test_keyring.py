@@ -0,0 +1,38 @@
+import json
+import os
+import stat
+
+import pytest
+
+from keyring import Keyring
+
+def write_keyring(tmp_path, data):
+    path = tmp_path / "keyring.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+def test_profiles_load(tmp_path):
+    path = write_keyring(tmp_path, {"default": "NETPASS",
+                                    "profiles": {"NET2": {"dictionary": "net2.txt", "password": "default"}},
+                                    "assignments": {"w1aw/p": "NET2"}})
+    keyring = Keyring.load(path)
+    assert keyring.profile_for("W1AW").dictionary == "net2.txt"
+    assert keyring.password_for("W1AW") == "NETPASS"
+
+@pytest.mark.parametrize("data", [
+    {"profiles": {"NET2": {"dictionary": "net2.txt", "colour": "red"}}},
+    {"profiles": {"NET2": {"password": "default"}}},
+    {"profiles": {"NET2": "net2.txt"}},
+    {"profiles": ["NET2"]},
+    ["NET2"],
+])
+def test_malformed_keyring_raises_value_error(tmp_path, data):
+    with pytest.raises(ValueError, match="keyring.json"):
+        Keyring.load(write_keyring(tmp_path, data))
+
+def test_saved_keyring_is_private(tmp_path):
+    keyring = Keyring(path=str(tmp_path / "keyring.json"))
+    keyring.set("KN4CRD", "SECRET")
+    keyring.save()
+    assert stat.S_IMODE(os.stat(keyring.path).st_mode) == 0o600
+    assert Keyring.load(keyring.path).password_for("KN4CRD") == "SECRET"
\ No newline at end of file
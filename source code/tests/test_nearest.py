@@ -0,0 +1,24 @@
+import shutil
+
+from codec import DEFAULT_DATABASE_PATH, Codec
+from nearest import TolerantDecoder
+
+def make_codec(tmp_path):
+    path = tmp_path / "database.txt"
+    shutil.copyfile(DEFAULT_DATABASE_PATH, path)
+    return Codec(str(path))
+
+def test_clean_round_trip_has_no_corrections(tmp_path):
+    codec = make_codec(tmp_path)
+    text = "how are you the weather is fine my friend kd9xyz 73 de w1aw qth grid fn31 ok"
+    payload = codec.encode(text, "secret")
+    decoded, corrections = TolerantDecoder(codec).decode(payload, "secret")
+    assert decoded == codec.decode(payload, "secret")
+    assert corrections == []
+
+def test_damaged_code_is_corrected():
+    codec = Codec()
+    codec.set_dictionary({"house": "XC[", "sun": "SU@", "world": "WO@"})
+    decoded, corrections = TolerantDecoder(codec).restore("SU@ XD[ WO@")
+    assert decoded == "sun house world"
+    assert [(c.received, c.word, c.applied) for c in corrections] == [("XD[", "house", True)]
\ No newline at end of file